@@ -194,12 +194,11 @@ async def get_fonts(
         cached_fonts = list(cache_dir.glob("*"))
         if cached_fonts:
             logger.info(f"Serving {len(cached_fonts)} cached fonts for media {media_id}")
-            from app.services.subtitles import extract_font_names
+            from app.services.subtitles import extract_font_names_from_file
 
             font_list = []
             for f in cached_fonts:
-                font_data = f.read_bytes()
-                font_names = extract_font_names(font_data)
+                font_names = extract_font_names_from_file(f)
                 font_list.append({
                     "filename": f.name,
                     "mimetype": "application/x-font-ttf",
@@ -224,12 +223,11 @@ async def get_fonts(
             cached_fonts = list(cache_dir.glob("*"))
             if cached_fonts:
                 logger.info(f"Serving {len(cached_fonts)} cached fonts for media {media_id} (after lock)")
-                from app.services.subtitles import extract_font_names
+                from app.services.subtitles import extract_font_names_from_file
 
                 font_list = []
                 for f in cached_fonts:
-                    font_data = f.read_bytes()
-                    font_names = extract_font_names(font_data)
+                    font_names = extract_font_names_from_file(f)
                     font_list.append({
                         "filename": f.name,
                         "mimetype": "application/x-font-ttf",
@@ -94,6 +94,10 @@ class Settings(BaseSettings):
     max_workers_standard: int = 1
     max_workers_premium: int = 10
     chunk_size_bytes: int = 1048576  # 1MB
+    stream_prefetch_chunks: int = 3  # Telegram chunks downloaded ahead of the HTTP consumer
+    file_id_cache_max_entries: int = 10000  # Refreshed (part, client) file_ids kept in memory
+    # Startup font/subtitle extractions in parallel (0 = half the worker pool)
+    subtitle_cache_concurrency: int = 0
 
     # ============================================
     # Scanner Settings
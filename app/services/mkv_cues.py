@@ -28,54 +28,32 @@ class CuePoint:
     track: int = 1  # Track number (usually 1 for video)
 
 
+# Vint length by first byte (position of the top set bit); 0 means an invalid 0x00 lead byte
+_VINT_LENGTH = bytes([0] + [9 - b.bit_length() for b in range(1, 256)])
+_VINT_MASK = tuple((1 << (7 * n)) - 1 for n in range(9))
+
+
 def read_vint(data: bytes, offset: int) -> tuple[int, int]:
     """
     Read EBML variable-length integer.
 
     Returns (value, bytes_consumed).
     """
-    if offset >= len(data):
+    end = len(data)
+    if offset >= end:
         return 0, 0
 
     first_byte = data[offset]
+    length = _VINT_LENGTH[first_byte]
 
-    # Determine length from leading bits
-    if first_byte & 0x80:  # 1 byte
+    # 1 and 2 byte sizes dominate block headers, keep them off int.from_bytes
+    if length == 1:
         return first_byte & 0x7F, 1
-    elif first_byte & 0x40:  # 2 bytes
-        if offset + 1 >= len(data):
-            return 0, 0
+    if length == 0 or offset + length > end:
+        return 0, 0
+    if length == 2:
         return ((first_byte & 0x3F) << 8) | data[offset + 1], 2
-    elif first_byte & 0x20:  # 3 bytes
-        if offset + 2 >= len(data):
-            return 0, 0
-        return ((first_byte & 0x1F) << 16) | (data[offset + 1] << 8) | data[offset + 2], 3
-    elif first_byte & 0x10:  # 4 bytes
-        if offset + 3 >= len(data):
-            return 0, 0
-        return ((first_byte & 0x0F) << 24) | (data[offset + 1] << 16) | (data[offset + 2] << 8) | data[offset + 3], 4
-    elif first_byte & 0x08:  # 5 bytes
-        if offset + 4 >= len(data):
-            return 0, 0
-        val = ((first_byte & 0x07) << 32) | (data[offset + 1] << 24) | (data[offset + 2] << 16) | (data[offset + 3] << 8) | data[offset + 4]
-        return val, 5
-    elif first_byte & 0x04:  # 6 bytes
-        if offset + 5 >= len(data):
-            return 0, 0
-        val = ((first_byte & 0x03) << 40) | (data[offset + 1] << 32) | (data[offset + 2] << 24) | (data[offset + 3] << 16) | (data[offset + 4] << 8) | data[offset + 5]
-        return val, 6
-    elif first_byte & 0x02:  # 7 bytes
-        if offset + 6 >= len(data):
-            return 0, 0
-        val = ((first_byte & 0x01) << 48) | (data[offset + 1] << 40) | (data[offset + 2] << 32) | (data[offset + 3] << 24) | (data[offset + 4] << 16) | (data[offset + 5] << 8) | data[offset + 6]
-        return val, 7
-    elif first_byte & 0x01:  # 8 bytes
-        if offset + 7 >= len(data):
-            return 0, 0
-        val = (data[offset + 1] << 48) | (data[offset + 2] << 40) | (data[offset + 3] << 32) | (data[offset + 4] << 24) | (data[offset + 5] << 16) | (data[offset + 6] << 8) | data[offset + 7]
-        return val, 8
-
-    return 0, 0
+    return int.from_bytes(data[offset : offset + length]) & _VINT_MASK[length], length
 
 
 def read_element_id(data: bytes, offset: int) -> tuple[int, int]:
@@ -112,10 +90,10 @@ def read_uint(data: bytes, offset: int, length: int) -> int:
     if offset + length > len(data):
         return 0
 
-    value = 0
-    for i in range(length):
-        value = (value << 8) | data[offset + i]
-    return value
+    # Single-byte fields (track type, flags, short timecodes) skip the slice
+    if length == 1:
+        return data[offset]
+    return int.from_bytes(data[offset : offset + length])
 
 
 # EBML Element IDs
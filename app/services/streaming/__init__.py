@@ -1,12 +1,13 @@
 """Streaming Service Package."""
 
-from app.services.streaming.manager import get_virtual_reader, release_reader
+from app.services.streaming.manager import build_reader, get_virtual_reader, release_reader
 from app.services.streaming.models import StreamPosition
 from app.services.streaming.reader import VirtualStreamReader
 
 __all__ = [
     "StreamPosition",
     "VirtualStreamReader",
+    "build_reader",
     "get_virtual_reader",
     "release_reader",
 ]
@@ -1,34 +1,61 @@
 """Streaming chunk cache."""
 
 import time
+from collections import OrderedDict
+
+from app.config import get_settings
+
+settings = get_settings()
+
+# TTL timestamps are monotonic (not epoch) so wall-clock jumps can't mass-evict entries
+_now = time.monotonic
 
 # Pyrogram uses 1MB chunks for streaming
 PYROGRAM_CHUNK_SIZE = 1024 * 1024  # 1MB
 
-# Cache for refreshed file_ids
-# Avoids refreshing file_id on every HTTP request
-_FILE_ID_CACHE: dict[int, tuple[str, float]] = {}
+# Cache for refreshed file_ids, keyed by (part_id, client_id) -> (file_id, expires_at)
+# Avoids refreshing file_id on every HTTP request; LRU-bounded so large
+# libraries can't grow it without limit before entries expire
+_FILE_ID_CACHE: OrderedDict[tuple[int, int], tuple[str, float]] = OrderedDict()
 _FILE_ID_CACHE_TTL = 30 * 60  # 30 minutes
+_FILE_ID_CACHE_MAX_SIZE = settings.file_id_cache_max_entries
 
-# Chunk cache for pre-fetched data
-# LRU-style cache to avoid re-downloading chunks
-_CHUNK_CACHE: dict[tuple[int, int], tuple[bytes, float]] = {}
+# Chunk cache for pre-fetched data, (part_id, chunk_index) -> (data, expires_at)
+# FIFO cache to avoid re-downloading chunks; kept in insertion order so
+# expiry and eviction only ever look at the oldest entries
+_CHUNK_CACHE: OrderedDict[tuple[int, int], tuple[bytes, float]] = OrderedDict()
 _CHUNK_CACHE_TTL = 60
 _CHUNK_CACHE_MAX_SIZE = 50
-_PREFETCH_CHUNKS = 3
 
 
 def _get_cached_chunk(part_id: int, chunk_index: int) -> bytes | None:
     """Get a chunk from cache if available and not expired."""
     key = (part_id, chunk_index)
     if key in _CHUNK_CACHE:
-        data, timestamp = _CHUNK_CACHE[key]
-        if time.time() - timestamp < _CHUNK_CACHE_TTL:
+        data, expires_at = _CHUNK_CACHE[key]
+        if _now() < expires_at:
             return data
         del _CHUNK_CACHE[key]
     return None
 
 
+def _get_file_id(cache_key: tuple[int, int], now: float) -> str | None:
+    """Get a cached file_id if present and not expired, marking it recently used."""
+    cached = _FILE_ID_CACHE.get(cache_key)
+    if cached is None or now >= cached[1]:
+        return None
+    _FILE_ID_CACHE.move_to_end(cache_key)
+    return cached[0]
+
+
+def _put_file_id(cache_key: tuple[int, int], file_id: str, now: float) -> None:
+    """Cache a refreshed file_id, evicting least recently used entries if needed."""
+    _FILE_ID_CACHE[cache_key] = (file_id, now + _FILE_ID_CACHE_TTL)
+    _FILE_ID_CACHE.move_to_end(cache_key)
+    while len(_FILE_ID_CACHE) > _FILE_ID_CACHE_MAX_SIZE:
+        _FILE_ID_CACHE.popitem(last=False)
+
+
 def invalidate_file_id_cache(part_id: int, client_id: int | None = None) -> None:
     """
     Invalidate cached file_id for a part (e.g., after FileReferenceExpired).
@@ -54,13 +81,16 @@ def invalidate_file_id_cache(part_id: int, client_id: int | None = None) -> None
 
 def _cache_chunk(part_id: int, chunk_index: int, data: bytes) -> None:
     """Cache a chunk, evicting old entries if needed."""
-    now = time.time()
-    expired = [k for k, (_, ts) in _CHUNK_CACHE.items() if now - ts > _CHUNK_CACHE_TTL]
-    for k in expired:
-        del _CHUNK_CACHE[k]
+    now = _now()
+    while _CHUNK_CACHE:
+        _, expires_at = next(iter(_CHUNK_CACHE.values()))
+        if now < expires_at:
+            break
+        _CHUNK_CACHE.popitem(last=False)
 
+    key = (part_id, chunk_index)
+    _CHUNK_CACHE.pop(key, None)
     while len(_CHUNK_CACHE) >= _CHUNK_CACHE_MAX_SIZE:
-        oldest_key = min(_CHUNK_CACHE.keys(), key=lambda k: _CHUNK_CACHE[k][1])
-        del _CHUNK_CACHE[oldest_key]
+        _CHUNK_CACHE.popitem(last=False)
 
-    _CHUNK_CACHE[(part_id, chunk_index)] = (data, now)
+    _CHUNK_CACHE[key] = (data, now + _CHUNK_CACHE_TTL)
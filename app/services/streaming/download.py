@@ -1,12 +1,14 @@
 """Telegram chunk download with retry logic."""
 
 import asyncio
+import contextlib
 from collections.abc import AsyncIterator, Callable
 
 from loguru import logger
 from pyrogram import Client
 from pyrogram.errors import FileReferenceExpired, FloodWait, RPCError
 
+from app.config import get_settings
 from app.models.media import MediaPart
 from app.services.streaming.cache import (
     PYROGRAM_CHUNK_SIZE,
@@ -16,6 +18,71 @@ from app.services.streaming.cache import (
 )
 from app.services.streaming.telegram import refresh_file_id
 
+settings = get_settings()
+
+
+class _Prefetcher:
+    """
+    Pull chunks from an async iterator into a bounded queue ahead of the consumer.
+
+    Overlaps the Telegram download with the HTTP send: the producer task keeps
+    fetching while the consumer is blocked on a slow client, up to maxsize
+    chunks. Source errors are queued after the chunks that preceded them.
+    """
+
+    def __init__(self, source: AsyncIterator[bytes], maxsize: int) -> None:
+        self._queue: asyncio.Queue[bytes | BaseException | None] = asyncio.Queue(maxsize)
+        self._task = asyncio.create_task(self._produce(source))
+
+    async def _produce(self, source: AsyncIterator[bytes]) -> None:
+        try:
+            async for chunk in source:
+                await self._queue.put(chunk)
+        except Exception as e:
+            await self._queue.put(e)
+            return
+        await self._queue.put(None)
+
+    def __aiter__(self) -> "_Prefetcher":
+        return self
+
+    async def __anext__(self) -> bytes:
+        item = await self._queue.get()
+        if item is None:
+            raise StopAsyncIteration
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        """Stop the producer (and the underlying download)."""
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+
+async def prefetch_first_chunk(
+    client: Client, part: MediaPart, file_id: str | None = None
+) -> None:
+    """
+    Fetch a part's first chunk into the chunk cache ahead of its stream_part call.
+
+    file_id overrides part.telegram_file_id when the prefetch runs on a
+    different client than the one the part's file_id was resolved for.
+    Best-effort: any failure just leaves the cache cold, and stream_part
+    fetches the chunk itself with its usual retry handling.
+    """
+    if _get_cached_chunk(part.id, 0):
+        return
+    try:
+        async with asyncio.timeout(20):
+            async for chunk in client.stream_media(
+                file_id or part.telegram_file_id, offset=0, limit=1
+            ):
+                _cache_chunk(part.id, 0, chunk)
+    except Exception as e:
+        logger.debug("Prefetch of part {} first chunk failed: {}", part.part_index, e)
+
 
 async def stream_part(
     client: Client,
@@ -24,18 +91,20 @@ async def stream_part(
     length: int,
     *,
     is_force_released: Callable[[], bool],
-) -> AsyncIterator[bytes]:
+) -> AsyncIterator[bytes | memoryview]:
     """
     Stream bytes from a single part with retry logic.
 
     Handles FileReferenceExpired by refreshing file_id and resuming from
     the last successfully downloaded chunk position.
+
+    Partial chunks (range start/end inside a 1MB chunk) are yielded as
+    memoryview slices to avoid copying; the cache always stores full bytes.
     """
     if not client:
         raise RuntimeError("No client provided")
 
     max_retries = 5
-    bytes_yielded = 0
     file_id = part.telegram_file_id
 
     initial_chunk_offset = offset // PYROGRAM_CHUNK_SIZE
@@ -44,57 +113,60 @@ async def stream_part(
     # Calculate total chunks needed
     total_chunks_needed = (length + initial_skip_bytes + PYROGRAM_CHUNK_SIZE - 1) // PYROGRAM_CHUNK_SIZE
 
-    logger.info(
-        f"[STREAM] Part {part.part_index}: offset={offset}, len={length}, chunks={total_chunks_needed}"
-    )
+    # Only the first and last chunks of the range are cut; everything between
+    # is yielded whole, so the loops below need no per-chunk length accounting
+    first_chunk = initial_chunk_offset
+    end_chunk = initial_chunk_offset + total_chunks_needed
+    last_chunk = end_chunk - 1
+    last_chunk_take = initial_skip_bytes + length - (total_chunks_needed - 1) * PYROGRAM_CHUNK_SIZE
 
-    # Phase 1: Serve from cache
-    cache_hits = 0
-    skip_bytes = initial_skip_bytes
-    for idx in range(initial_chunk_offset, initial_chunk_offset + total_chunks_needed):
-        cached = _get_cached_chunk(part.id, idx)
-        if cached:
-            cache_hits += 1
-            chunk = cached
-
-            if skip_bytes > 0:
-                if len(chunk) <= skip_bytes:
-                    skip_bytes -= len(chunk)
-                    continue
-                chunk = chunk[skip_bytes:]
-                skip_bytes = 0
+    def trim_edge(idx: int, chunk: bytes) -> memoryview:
+        """Cut the range's first/last chunk down to the requested bytes."""
+        start = initial_skip_bytes if idx == first_chunk else 0
+        stop = last_chunk_take if idx == last_chunk else None
+        return memoryview(chunk)[start:stop]
 
-            if not chunk:
-                continue
+    # Hot path: positional args so loguru formats only when the level is enabled
+    logger.info(
+        "[STREAM] Part {}: offset={}, len={}, chunks={}",
+        part.part_index, offset, length, total_chunks_needed,
+    )
 
-            chunk_len = len(chunk)
-            if bytes_yielded + chunk_len > length:
-                needed = length - bytes_yielded
-                yield chunk[:needed]
-                bytes_yielded += needed
-            else:
-                yield chunk
-                bytes_yielded += chunk_len
+    # Per-chunk helpers bound as locals (LOAD_FAST) for the loops below
+    get_cached = _get_cached_chunk
+    cache_chunk = _cache_chunk
 
-            if bytes_yielded >= length:
-                if cache_hits > 0:
-                    logger.debug(f"Served {cache_hits} chunks from cache")
-                return
-        else:
+    # Phase 1: Pre-scan the cache for a hit prefix and a hit suffix.
+    # Only the miss range between them is fetched, in one stream_media call.
+    prefix: list[bytes] = []
+    for idx in range(first_chunk, end_chunk):
+        cached = get_cached(part.id, idx)
+        if not cached:
             break
+        prefix.append(cached)
+    suffix: list[bytes] = []
+    for idx in range(end_chunk - 1, first_chunk + len(prefix) - 1, -1):
+        cached = get_cached(part.id, idx)
+        if not cached:
+            break
+        suffix.append(cached)
+    suffix.reverse()
 
-    if bytes_yielded >= length:
-        if cache_hits > 0:
-            logger.debug(f"Served {cache_hits} chunks from cache (complete)")
+    for idx, chunk in enumerate(prefix, first_chunk):
+        yield trim_edge(idx, chunk) if idx == first_chunk or idx == last_chunk else chunk
+    if len(prefix) == total_chunks_needed:
+        logger.trace("Served {} chunks from cache (complete)", len(prefix))
         return
 
-    # Phase 2: Fetch remaining chunks from Telegram with retry
-    next_chunk_to_fetch = initial_chunk_offset + cache_hits
-    chunks_remaining = total_chunks_needed - cache_hits
-    skip_bytes_for_fetch = initial_skip_bytes if cache_hits == 0 else 0
+    # Phase 2: Fetch the miss range from Telegram with retry
+    next_chunk_to_fetch = first_chunk + len(prefix)
+    chunks_remaining = total_chunks_needed - len(prefix) - len(suffix)
 
-    if cache_hits > 0:
-        logger.debug(f"Cache hit: {cache_hits} chunks, fetching {chunks_remaining} more")
+    if prefix or suffix:
+        logger.debug(
+            "Cache hit: {} prefix + {} suffix chunks, fetching {} more",
+            len(prefix), len(suffix), chunks_remaining,
+        )
 
     attempt = 0
     consecutive_failures = 0
@@ -104,63 +176,50 @@ async def stream_part(
     # before raising OSError. We abort each chunk after 20s to fail fast.
     CHUNK_TIMEOUT = 20.0
 
-    while attempt < max_retries:
+    while chunks_remaining > 0 and attempt < max_retries:
         try:
             chunks_fetched_this_attempt = 0
-            stream_iter = client.stream_media(
-                file_id,
-                offset=next_chunk_to_fetch,
-                limit=chunks_remaining,
-            ).__aiter__()
-
-            while True:
-                # Bail out if force-released
-                if is_force_released():
-                    logger.info("[STREAM] Aborting stream_part: reader was force-released")
-                    return
-
-                try:
-                    chunk = await asyncio.wait_for(
-                        stream_iter.__anext__(), timeout=CHUNK_TIMEOUT
-                    )
-                except StopAsyncIteration:
-                    break
-                except TimeoutError:
-                    raise OSError(
-                        f"Chunk fetch timeout after {CHUNK_TIMEOUT}s — stale media session"
-                    ) from None
-
-                # Cache the chunk
-                _cache_chunk(part.id, next_chunk_to_fetch, chunk)
-                chunks_fetched_this_attempt += 1
-
-                # Update position for potential resume
-                next_chunk_to_fetch += 1
-                chunks_remaining -= 1
-
-                # Handle skip bytes for first chunk
-                if skip_bytes_for_fetch > 0:
-                    if len(chunk) <= skip_bytes_for_fetch:
-                        skip_bytes_for_fetch -= len(chunk)
-                        continue
-                    chunk = chunk[skip_bytes_for_fetch:]
-                    skip_bytes_for_fetch = 0
-
-                if not chunk:
-                    continue
-
-                chunk_len = len(chunk)
-                if bytes_yielded + chunk_len > length:
-                    needed = length - bytes_yielded
-                    yield chunk[:needed]
-                    bytes_yielded += needed
-                    return
-                else:
-                    yield chunk
-                    bytes_yielded += chunk_len
+            stream_iter = _Prefetcher(
+                client.stream_media(
+                    file_id,
+                    offset=next_chunk_to_fetch,
+                    limit=chunks_remaining,
+                ),
+                max(2, settings.stream_prefetch_chunks),
+            )
+
+            try:
+                while True:
+                    # Bail out if force-released
+                    if is_force_released():
+                        logger.info("[STREAM] Aborting stream_part: reader was force-released")
+                        return
 
-                if bytes_yielded >= length:
-                    return
+                    try:
+                        chunk = await asyncio.wait_for(
+                            stream_iter.__anext__(), timeout=CHUNK_TIMEOUT
+                        )
+                    except StopAsyncIteration:
+                        break
+                    except TimeoutError:
+                        raise OSError(
+                            f"Chunk fetch timeout after {CHUNK_TIMEOUT}s — stale media session"
+                        ) from None
+
+                    # Cache the chunk
+                    cache_chunk(part.id, next_chunk_to_fetch, chunk)
+                    chunks_fetched_this_attempt += 1
+
+                    # Update position for potential resume
+                    idx = next_chunk_to_fetch
+                    next_chunk_to_fetch += 1
+                    chunks_remaining -= 1
+
+                    yield trim_edge(idx, chunk) if idx == first_chunk or idx == last_chunk else chunk
+                    if idx == last_chunk:
+                        return
+            finally:
+                await stream_iter.aclose()
 
             # Check if we got all expected chunks
             if chunks_remaining > 0:
@@ -185,7 +244,7 @@ async def stream_part(
                     continue
 
             # Successfully completed
-            return
+            break
 
         except RPCError as e:
             file_id = await _handle_rpc_error(e, part, client, file_id, next_chunk_to_fetch, attempt, max_retries)
@@ -248,8 +307,13 @@ async def stream_part(
             logger.error(f"Unexpected error streaming part {part.id}: {type(e).__name__}: {e}")
             raise
 
-    logger.error(f"Exhausted all {max_retries} retries for part {part.id}")
-    raise RuntimeError(f"Failed to stream part {part.id} after {max_retries} retries")
+    if chunks_remaining > 0:
+        logger.error(f"Exhausted all {max_retries} retries for part {part.id}")
+        raise RuntimeError(f"Failed to stream part {part.id} after {max_retries} retries")
+
+    # Phase 3: Serve the cached suffix
+    for idx, chunk in enumerate(suffix, end_chunk - len(suffix)):
+        yield trim_edge(idx, chunk) if idx == first_chunk or idx == last_chunk else chunk
 
 
 async def _handle_consecutive_failures(
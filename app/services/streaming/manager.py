@@ -1,22 +1,37 @@
 """Reader lifecycle management (cache, factory, release, cleanup)."""
 
-import time
+import asyncio
+from collections import OrderedDict
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.config import get_settings
 from app.core.worker_manager import worker_manager
 from app.models.media import MediaItem
+from app.services.streaming.cache import _now
 from app.services.streaming.reader import VirtualStreamReader
 
 settings = get_settings()
 
+# Built once; SQLAlchemy reuses its compiled form across calls
+_MEDIA_WITH_PARTS_STMT = (
+    select(MediaItem)
+    .where(MediaItem.id == bindparam("media_id"))
+    .options(selectinload(MediaItem.parts))
+)
+
 # Readers persist across HTTP range requests so they can accumulate clients
-_reader_cache: dict[int, tuple[VirtualStreamReader, float]] = {}
+# Process-local by design: the Telegram client pool is per-process too, so the
+# app runs as a single uvicorn worker and every range request lands here
+# Timestamps are monotonic (not epoch) last-access times; entries are kept in
+# last-access order (oldest first) so cleanup can stop at the first fresh one
+_reader_cache: OrderedDict[int, tuple[VirtualStreamReader, float]] = OrderedDict()
 _READER_TTL = 60  # Seconds of inactivity before releasing
+# Per-media locks so concurrent first requests build a single persistent reader
+_reader_locks: dict[int, asyncio.Lock] = {}
 
 
 async def get_virtual_reader(
@@ -27,7 +42,9 @@ async def get_virtual_reader(
 
     When persistent=True, the reader is cached and reused across requests.
     This enables dynamic client scaling: each reuse tries to acquire more
-    clients from the pool, so the stream gets faster over time.
+    clients from the pool, so the stream gets faster over time. Concurrent
+    first requests for the same media wait on a per-media lock, so only
+    one of them queries the DB and builds the reader.
 
     Args:
         session: Database session
@@ -37,45 +54,78 @@ async def get_virtual_reader(
     Returns:
         VirtualStreamReader or None if media not found
     """
-    # Check cache for persistent readers
-    if persistent and media_id in _reader_cache:
-        reader, _ = _reader_cache[media_id]
-        _reader_cache[media_id] = (reader, time.time())
-        logger.info(
-            f"[READER] Reusing cached reader for media {media_id} "
-            f"({len(reader._clients)} clients)"
-        )
+    if not persistent:
+        return await _create_reader(session, media_id)
+
+    reader = _reuse_cached_reader(media_id)
+    if reader is not None:
         return reader
 
-    # Create new reader
-    query = (
-        select(MediaItem)
-        .where(MediaItem.id == media_id)
-        .options(selectinload(MediaItem.parts))
+    if (lock := _reader_locks.get(media_id)) is None:
+        lock = _reader_locks[media_id] = asyncio.Lock()
+
+    async with lock:
+        # Another request may have created the reader while we waited
+        reader = _reuse_cached_reader(media_id)
+        if reader is not None:
+            return reader
+
+        reader = await _create_reader(session, media_id)
+        if reader is not None:
+            reader._persistent = True
+            _reader_cache[media_id] = (reader, _now())
+            logger.info(f"[READER] Created persistent reader for media {media_id}")
+            return reader
+
+    # Nothing was cached, so nothing will call release_reader for this media
+    if _reader_locks.get(media_id) is lock and not lock.locked():
+        del _reader_locks[media_id]
+    return None
+
+
+def _reuse_cached_reader(media_id: int) -> VirtualStreamReader | None:
+    """Return the cached persistent reader for media_id and refresh its last access."""
+    entry = _reader_cache.get(media_id)
+    if entry is None:
+        return None
+    reader, _ = entry
+    _reader_cache[media_id] = (reader, _now())
+    _reader_cache.move_to_end(media_id)
+    logger.info(
+        f"[READER] Reusing cached reader for media {media_id} "
+        f"({len(reader._clients)} clients)"
     )
-    result = await session.execute(query)
+    return reader
+
+
+async def _create_reader(session: AsyncSession, media_id: int) -> VirtualStreamReader | None:
+    """Load a media item with its parts and build a new reader for it."""
+    result = await session.execute(_MEDIA_WITH_PARTS_STMT, {"media_id": media_id})
     media_item = result.scalar_one_or_none()
 
     if media_item is None:
         return None
 
+    return build_reader(session, media_item)
+
+
+def build_reader(session: AsyncSession, media_item: MediaItem) -> VirtualStreamReader | None:
+    """
+    Build a non-persistent reader for a media item whose parts are already loaded.
+
+    For callers that loaded the item themselves (e.g. together with its
+    streams), to skip get_virtual_reader's own query.
+    """
     if not media_item.parts:
-        logger.error(f"Media {media_id} has no parts")
+        logger.error(f"Media {media_item.id} has no parts")
         return None
 
-    reader = VirtualStreamReader(
+    return VirtualStreamReader(
         media_item=media_item,
         session=session,
         chunk_size=settings.chunk_size_bytes,
     )
 
-    if persistent:
-        reader._persistent = True
-        _reader_cache[media_id] = (reader, time.time())
-        logger.info(f"[READER] Created persistent reader for media {media_id}")
-
-    return reader
-
 
 async def release_reader(media_id: int) -> None:
     """Explicitly release a cached reader and its clients.
@@ -83,6 +133,10 @@ async def release_reader(media_id: int) -> None:
     Force-releases immediately regardless of active streams.
     Called when user navigates away — stream is no longer needed.
     """
+    lock = _reader_locks.get(media_id)
+    if lock is not None and not lock.locked():
+        del _reader_locks[media_id]
+
     entry = _reader_cache.pop(media_id, None)
     if entry:
         reader, _ = entry
@@ -94,7 +148,6 @@ async def release_reader(media_id: int) -> None:
             count = len(reader._clients)
             worker_manager.release_clients(reader._clients)
             reader._clients = []
-            reader._workers = []
             logger.info(
                 f"[READER] Force-released {count} client(s) for media {media_id}"
                 f"{f' ({active} stream(s) were active)' if active else ''}"
@@ -103,10 +156,19 @@ async def release_reader(media_id: int) -> None:
 
 async def cleanup_stale_readers() -> None:
     """Release readers that haven't been used recently and have no active streams."""
-    now = time.time()
-    stale = [
-        mid for mid, (reader, last_access) in _reader_cache.items()
-        if now - last_access > _READER_TTL and reader._active_streams == 0
-    ]
+    now = _now()
+    stale = []
+    for mid, (reader, last_access) in _reader_cache.items():
+        if now - last_access <= _READER_TTL:
+            break
+        if reader._active_streams == 0:
+            stale.append(mid)
     for mid in stale:
         await release_reader(mid)
+
+    # Locks left behind by media that never got a cached reader
+    orphaned = [
+        mid for mid, lock in _reader_locks.items() if mid not in _reader_cache and not lock.locked()
+    ]
+    for mid in orphaned:
+        del _reader_locks[mid]
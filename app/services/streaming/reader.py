@@ -1,8 +1,10 @@
 """Virtual Stream Reader — unified file-like interface over Telegram parts."""
 
 import asyncio
+import bisect
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
+from itertools import accumulate
 
 from loguru import logger
 from pyrogram import Client
@@ -10,7 +12,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.worker_manager import MAX_CLIENTS_PER_STREAM, worker_manager
 from app.models.media import MediaItem, MediaPart
-from app.services.streaming.download import stream_part
+from app.services.streaming.cache import PYROGRAM_CHUNK_SIZE, _get_file_id, _now
+from app.services.streaming.download import prefetch_first_chunk, stream_part
 from app.services.streaming.models import StreamPosition
 from app.services.streaming.telegram import (
     ensure_file_ids_for_client,
@@ -36,13 +39,20 @@ class VirtualStreamReader:
         self._session = session
         self._chunk_size = chunk_size
         self._parts: list[MediaPart] = sorted(media_item.parts, key=lambda p: p.part_index)
-        self._total_size = sum(p.file_size for p in self._parts)
-        self._current_position = 0
-        self._workers: list = []
+        # Cumulative part offsets: lookup and total size come from the same sizes,
+        # and plain-int (start, end, size) tuples keep ORM access off the hot path
+        sizes = [p.file_size for p in self._parts]
+        offsets = list(accumulate(sizes, initial=0))
+        self._total_size = offsets[-1]
+        self._part_starts: list[int] = offsets[:-1]
+        self._part_bounds: list[tuple[int, int, int]] = [
+            (start, start + size, size) for start, size in zip(self._part_starts, sizes, strict=True)
+        ]
         self._clients: list[Client] = []
         self._batch_mode_active = False
         self._persistent = False
-        self._rr_counter = 0
+        # In-flight read_range calls per client, keyed by id(client)
+        self._client_inflight: dict[int, int] = {}
         self._active_streams = 0
         self._force_released = False
 
@@ -61,16 +71,28 @@ class VirtualStreamReader:
         """The media item being streamed."""
         return self._media_item
 
+    @property
+    def client_count(self) -> int:
+        """Number of worker clients the reader currently holds."""
+        return len(self._clients)
+
     # --- Part lookup ---
 
+    def _part_index_for_offset(self, byte_offset: int) -> int:
+        """Index of the part containing the given byte offset, or -1."""
+        if byte_offset < 0 or byte_offset >= self._total_size:
+            return -1
+        # Parts are contiguous, so the last start <= offset is always the owner
+        return bisect.bisect_right(self._part_starts, byte_offset) - 1
+
     def _find_part_for_offset(self, byte_offset: int) -> StreamPosition | None:
         """Find which part contains the given byte offset."""
-        if byte_offset < 0 or byte_offset >= self._total_size:
+        idx = self._part_index_for_offset(byte_offset)
+        if idx < 0:
             return None
-        for part in self._parts:
-            if part.contains_byte(byte_offset):
-                return StreamPosition(part=part, local_offset=part.local_offset(byte_offset))
-        return None
+        return StreamPosition(
+            part=self._parts[idx], local_offset=byte_offset - self._part_starts[idx]
+        )
 
     # --- Batch mode ---
 
@@ -104,12 +126,11 @@ class VirtualStreamReader:
             logger.error("No workers available for streaming")
             return False
         self._clients = clients
-        self._workers = []
         logger.info(f"[STREAM] Acquired {len(self._clients)} client(s) from pool")
         return True
 
-    async def _try_scale_up(self) -> None:
-        """Try to dynamically acquire one more client from the pool."""
+    async def _try_scale_up(self, parts: list[MediaPart]) -> None:
+        """Try to dynamically acquire one more client, pre-refreshing the given parts."""
         if len(self._clients) >= MAX_CLIENTS_PER_STREAM:
             return
         if worker_manager.pool_pressure() > 0.75:
@@ -123,13 +144,32 @@ class VirtualStreamReader:
             return
 
         try:
-            await ensure_file_ids_for_client(self._parts, client)
+            await ensure_file_ids_for_client(parts, client)
             self._clients.append(client)
             logger.info(f"[STREAM] Scale-up: now {len(self._clients)} clients")
         except Exception as e:
             logger.warning(f"Scale-up failed, releasing client: {e}")
             worker_manager.release_clients([client])
 
+    def _prefetch_source(self, client: Client, part: MediaPart) -> tuple[Client, str | None]:
+        """
+        Pick the client (and its file_id) for prefetching a part's first chunk.
+
+        Prefers the least-loaded other client with a cached file_id for the part,
+        so the prefetch doesn't queue behind the current part on the reading
+        client's download slot. Falls back to the reading client otherwise.
+        """
+        inflight = self._client_inflight
+        now = _now()
+        others = sorted(
+            (c for c in self._clients if c is not client), key=lambda c: inflight.get(id(c), 0)
+        )
+        for other in others:
+            file_id = _get_file_id((part.id, id(other)), now)
+            if file_id is not None:
+                return other, file_id
+        return client, None
+
     def _try_scale_down(self) -> None:
         """Release excess clients when pool is under pressure."""
         if len(self._clients) <= 1:
@@ -148,21 +188,27 @@ class VirtualStreamReader:
         """Release workers back to the pool for reuse."""
         if self._batch_mode_active or self._persistent:
             return
+        # Another read_range is still streaming on these clients; the last one
+        # to finish releases them
+        if self._active_streams > 0:
+            return
         if self._clients:
             count = len(self._clients)
             worker_manager.release_clients(self._clients)
             logger.info(f"[STREAM] Released {count} client(s) back to pool")
-        self._workers = []
         self._clients = []
 
     # --- Main streaming ---
 
-    async def read_range(self, start: int, end: int | None = None) -> AsyncIterator[bytes]:
+    async def read_range(
+        self, start: int, end: int | None = None
+    ) -> AsyncIterator[bytes | memoryview]:
         """
         Read a range of bytes from the virtual stream.
 
         Yields chunks of bytes for the requested range, handling part boundaries
-        and fetching data from Telegram transparently.
+        and fetching data from Telegram transparently. Chunks may be memoryview
+        slices; consumers that need an owned copy should call bytes() on them.
         """
         if end is None:
             end = self._total_size
@@ -171,61 +217,110 @@ class VirtualStreamReader:
         if start >= end:
             return
 
+        # Resolve the first and last parts once; only these need valid file_ids
+        first_idx = self._part_index_for_offset(start)
+        last_idx = self._part_index_for_offset(end - 1)
+        range_parts = self._parts[first_idx : last_idx + 1]
+
+        prefetch: asyncio.Task | None = None
+        client_key: int | None = None
         self._active_streams += 1
         try:
+            # No upfront refresh_all_file_ids here: file_references are per
+            # session, so only the client picked below needs them, and
+            # ensure_file_ids_for_client refreshes exactly that client's misses
             if not self._batch_mode_active:
                 if not await self._ensure_workers():
                     raise RuntimeError("No workers available")
-                await refresh_all_file_ids(self._clients, self._parts)
-
-            if not self._batch_mode_active:
                 self._try_scale_down()
-                await self._try_scale_up()
+                await self._try_scale_up(range_parts)
 
             if not self._clients:
                 raise RuntimeError("No clients available")
 
-            client_idx = self._rr_counter % len(self._clients)
-            self._rr_counter += 1
-            client = self._clients[client_idx]
+            # Least-loaded client: concurrent ranges fan out instead of
+            # queueing on one connection while others sit idle
+            inflight = self._client_inflight
+            client = min(self._clients, key=lambda c: inflight.get(id(c), 0))
+            client_key = id(client)
+            inflight[client_key] = inflight.get(client_key, 0) + 1
 
-            await ensure_file_ids_for_client(self._parts, client)
+            await ensure_file_ids_for_client(range_parts, client)
 
             current_offset = start
 
-            while current_offset < end:
+            # Parts are contiguous: after the first one, each part is read from its start
+            for idx in range(first_idx, last_idx + 1):
                 if self._force_released:
                     logger.info("[STREAM] Aborting read_range: reader was force-released")
                     return
 
-                pos = self._find_part_for_offset(current_offset)
-                if not pos:
-                    break
+                if prefetch is not None:
+                    # Next part's first chunk lands in the chunk cache for stream_part
+                    await prefetch
+                    prefetch = None
 
-                part_remaining = pos.part.file_size - pos.local_offset
-                chunk_len = min(part_remaining, end - current_offset)
+                part_start, part_end, _ = self._part_bounds[idx]
+                part_stop = min(part_end, end)
+                next_part = self._parts[idx + 1] if idx < last_idx else None
 
                 async for chunk in stream_part(
                     client,
-                    pos.part,
-                    offset=pos.local_offset,
-                    length=chunk_len,
+                    self._parts[idx],
+                    offset=current_offset - part_start,
+                    length=part_stop - current_offset,
                     is_force_released=lambda: self._force_released,
                 ):
                     yield chunk
                     current_offset += len(chunk)
-                    if current_offset >= end:
-                        break
+                    # On the current part's last chunk, start fetching the next
+                    # part so the boundary doesn't stall for a Telegram round-trip
+                    if (
+                        next_part is not None
+                        and prefetch is None
+                        and part_stop - current_offset <= PYROGRAM_CHUNK_SIZE
+                    ):
+                        prefetch_client, file_id = self._prefetch_source(client, next_part)
+                        prefetch = asyncio.create_task(
+                            prefetch_first_chunk(prefetch_client, next_part, file_id)
+                        )
+
+                if current_offset < part_stop:
+                    # stream_part only stops short when the reader was force-released
+                    return
 
         except asyncio.CancelledError:
             raise
         finally:
+            if prefetch is not None:
+                prefetch.cancel()
+            if client_key is not None:
+                remaining = self._client_inflight.pop(client_key) - 1
+                if remaining > 0:
+                    self._client_inflight[client_key] = remaining
             self._active_streams = max(0, self._active_streams - 1)
             if not self._batch_mode_active:
                 try:
                     await self._release_workers()
                 except Exception:
-                    if self._clients:
+                    if self._clients and self._active_streams == 0:
                         worker_manager.release_clients(self._clients)
-                    self._workers = []
-                    self._clients = []
+                        self._clients = []
+
+    async def read_range_into(self, buf: memoryview, start: int, end: int | None = None) -> int:
+        """
+        Read a range of bytes straight into a caller-provided buffer.
+
+        For callers that want the whole range in one buffer: each chunk is copied
+        once into buf instead of being collected and joined afterwards.
+        buf must be writable and hold at least end - start bytes.
+
+        Returns:
+            Number of bytes written to buf
+        """
+        pos = 0
+        async for chunk in self.read_range(start, end):
+            n = len(chunk)
+            buf[pos : pos + n] = chunk
+            pos += n
+        return pos
@@ -1,12 +1,15 @@
 """Telegram API helpers for streaming (peer cache, file_id refresh)."""
 
-import time
+import asyncio
 
 from loguru import logger
 from pyrogram import Client
 
 from app.models.media import MediaPart
-from app.services.streaming.cache import _FILE_ID_CACHE, _FILE_ID_CACHE_TTL
+from app.services.streaming.cache import _get_file_id, _now, _put_file_id
+
+# Max concurrent file_id refreshes per client (keeps headroom against FloodWait)
+_REFRESH_CONCURRENCY = 4
 
 
 async def populate_peer_cache(client: Client, parts: list[MediaPart]) -> None:
@@ -40,8 +43,6 @@ async def _fetch_file_id_from_channel(
     client: Client, channel_id: int, message_id: int
 ) -> str | None:
     """Fetch file_id from a specific channel/message pair."""
-    import asyncio
-
     messages = await asyncio.wait_for(
         client.get_messages(chat_id=channel_id, message_ids=message_id),
         timeout=10.0,
@@ -53,6 +54,22 @@ async def _fetch_file_id_from_channel(
     return doc.file_id if doc else None
 
 
+async def _fetch_file_ids_from_channel(
+    client: Client, channel_id: int, message_ids: list[int]
+) -> dict[int, str]:
+    """Fetch file_ids for several messages of one channel in a single request."""
+    messages = await asyncio.wait_for(
+        client.get_messages(chat_id=channel_id, message_ids=message_ids),
+        timeout=10.0,
+    )
+    file_ids: dict[int, str] = {}
+    for message in messages or ():
+        doc = message and (message.document or message.video)
+        if doc:
+            file_ids[message.id] = doc.file_id
+    return file_ids
+
+
 async def refresh_file_id(part: MediaPart, client: Client) -> str | None:
     """
     Refresh expired file_id by fetching the original message.
@@ -102,6 +119,71 @@ async def refresh_file_id(part: MediaPart, client: Client) -> str | None:
     return None
 
 
+def _apply_cached_file_ids(
+    parts: list[MediaPart], client_id: int, now: float
+) -> list[MediaPart]:
+    """
+    Apply fresh cached file_ids for a client in one pass.
+
+    Returns the parts whose file_id is missing or expired for that client.
+    """
+    misses: list[MediaPart] = []
+    for part in parts:
+        cached_file_id = _get_file_id((part.id, client_id), now)
+        if cached_file_id is None:
+            misses.append(part)
+        else:
+            part.telegram_file_id = cached_file_id
+    return misses
+
+
+async def _refresh_file_ids(parts: list[MediaPart], client: Client, now: float) -> None:
+    """
+    Refresh file_ids for several parts and cache the results.
+
+    Parts are fetched with one get_messages call per channel; any part that
+    batch doesn't resolve goes through refresh_file_id (with its backup
+    channel fallback), concurrently, with a semaphore capping how many run
+    at once on the same client.
+    """
+    client_id = id(client)
+
+    by_channel: dict[int, list[MediaPart]] = {}
+    for part in parts:
+        by_channel.setdefault(part.channel_id, []).append(part)
+
+    leftovers: list[MediaPart] = []
+    for channel_id, group in by_channel.items():
+        try:
+            file_ids = await _fetch_file_ids_from_channel(
+                client, channel_id, [p.message_id for p in group]
+            )
+        except Exception as e:
+            logger.warning(f"Batch file_id refresh failed for channel {channel_id}: {e}")
+            file_ids = {}
+        for part in group:
+            new_file_id = file_ids.get(part.message_id)
+            if new_file_id:
+                part.telegram_file_id = new_file_id
+                _put_file_id((part.id, client_id), new_file_id, now)
+            else:
+                leftovers.append(part)
+
+    if not leftovers:
+        return
+
+    semaphore = asyncio.Semaphore(_REFRESH_CONCURRENCY)
+
+    async def refresh_one(part: MediaPart) -> str | None:
+        async with semaphore:
+            return await refresh_file_id(part, client)
+
+    results = await asyncio.gather(*(refresh_one(p) for p in leftovers), return_exceptions=True)
+    for part, new_file_id in zip(leftovers, results, strict=True):
+        if isinstance(new_file_id, str):
+            _put_file_id((part.id, client_id), new_file_id, now)
+
+
 async def refresh_all_file_ids(
     clients: list[Client], parts: list[MediaPart]
 ) -> None:
@@ -110,48 +192,25 @@ async def refresh_all_file_ids(
 
     Writes cache entries keyed by (part.id, client_id) so that
     ensure_file_ids_for_client finds them without re-fetching from Telegram.
+    Like refresh_file_id, this never writes to the DB: file_references are
+    session-specific, so refreshed ids only live in _FILE_ID_CACHE.
     """
     if not clients:
         logger.warning("No clients available for file_id refresh")
         return
 
-    now = time.time()
+    now = _now()
     client = clients[0]
     client_id = id(client)
 
-    # Check if any part needs refresh for the primary client
-    needs_refresh = False
-    for part in parts:
-        cache_key = (part.id, client_id)
-        cached = _FILE_ID_CACHE.get(cache_key)
-        if cached is None:
-            logger.debug(f"Part {part.id} not in cache, needs refresh")
-            needs_refresh = True
-            break
-        elif (now - cached[1]) > _FILE_ID_CACHE_TTL:
-            logger.debug(
-                f"Part {part.id} cache expired (age={(now - cached[1]):.0f}s), needs refresh"
-            )
-            needs_refresh = True
-            break
-        else:
-            part.telegram_file_id = cached[0]
-
-    if not needs_refresh:
-        logger.info("[STREAM] All file_ids cached, skipping refresh")
+    to_refresh = _apply_cached_file_ids(parts, client_id, now)
+    if not to_refresh:
+        logger.debug("[STREAM] All file_ids cached, skipping refresh")
         return
 
-    await populate_peer_cache(client, parts)
-
-    for part in parts:
-        cache_key = (part.id, client_id)
-        cached = _FILE_ID_CACHE.get(cache_key)
-        if cached and (now - cached[1]) <= _FILE_ID_CACHE_TTL:
-            part.telegram_file_id = cached[0]
-            continue
-        new_file_id = await refresh_file_id(part, client)
-        if new_file_id:
-            _FILE_ID_CACHE[cache_key] = (new_file_id, now)
+    logger.debug("{}/{} parts not cached or expired, refreshing", len(to_refresh), len(parts))
+    await populate_peer_cache(client, to_refresh)
+    await _refresh_file_ids(to_refresh, client, now)
 
 
 async def ensure_file_ids_for_client(
@@ -165,20 +224,10 @@ async def ensure_file_ids_for_client(
     FileReferenceExpired errors during the stream.
     """
     client_id = id(client)
+    now = _now()
 
-    for part in parts:
-        cache_key = (part.id, client_id)
-
-        # Check if we have a recent file_id for this client+part combo
-        cached = _FILE_ID_CACHE.get(cache_key)
-        now = time.time()
-
-        if cached and (now - cached[1]) <= _FILE_ID_CACHE_TTL:
-            part.telegram_file_id = cached[0]
-            continue
-
-        # Need to refresh for this client
-        logger.debug(f"Refreshing file_id for part {part.part_index} (client {client_id})")
-        new_file_id = await refresh_file_id(part, client)
-        if new_file_id:
-            _FILE_ID_CACHE[cache_key] = (new_file_id, now)
+    misses = _apply_cached_file_ids(parts, client_id, now)
+    if misses:
+        logger.debug("Refreshing {} file_id(s) for client {}", len(misses), client_id)
+        await populate_peer_cache(client, misses)
+        await _refresh_file_ids(misses, client, now)
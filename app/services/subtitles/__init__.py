@@ -1,6 +1,6 @@
 """Subtitles Service Package."""
 
-from app.services.subtitles.fonts import extract_font_names
+from app.services.subtitles.fonts import extract_font_names, extract_font_names_from_file
 from app.services.subtitles.models import AttachedFont, SubtitleTrack
 from app.services.subtitles.service import SubtitleExtractor, subtitle_extractor
 
@@ -8,6 +8,7 @@ __all__ = [
     "AttachedFont",
     "SubtitleTrack",
     "extract_font_names",
+    "extract_font_names_from_file",
     "SubtitleExtractor",
     "subtitle_extractor",
 ]
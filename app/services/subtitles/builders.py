@@ -1,26 +1,27 @@
 """ASS and SRT subtitle content builders."""
 
-from io import BytesIO
-
 from app.services.subtitles.ebml_parser import MkvSubtitleTrack, SubtitleEvent
 
+# Zero-padded component strings, so the per-event formatters below
+# index a tuple instead of running a format spec for every field
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(100))
+_THREE_DIGITS = tuple(f"{i:03d}" for i in range(1000))
+
 
 def _format_ass_time(ms: int) -> str:
     """Format milliseconds as ASS timestamp H:MM:SS.cc."""
-    h = ms // 3600000
-    m = (ms % 3600000) // 60000
-    s = (ms % 60000) // 1000
-    cs = (ms % 1000) // 10
-    return f"{h}:{m:02d}:{s:02d}.{cs:02d}"
+    h, rem = divmod(ms, 3600000)
+    m, rem = divmod(rem, 60000)
+    s, rem = divmod(rem, 1000)
+    return f"{h}:{_TWO_DIGITS[m]}:{_TWO_DIGITS[s]}.{_TWO_DIGITS[rem // 10]}"
 
 
 def _format_srt_time(ms: int) -> str:
     """Format milliseconds as SRT timestamp HH:MM:SS,mmm."""
-    h = ms // 3600000
-    m = (ms % 3600000) // 60000
-    s = (ms % 60000) // 1000
-    sms = ms % 1000
-    return f"{h:02d}:{m:02d}:{s:02d},{sms:03d}"
+    h, rem = divmod(ms, 3600000)
+    m, rem = divmod(rem, 60000)
+    s, rem = divmod(rem, 1000)
+    return f"{h:02d}:{_TWO_DIGITS[m]}:{_TWO_DIGITS[s]},{_THREE_DIGITS[rem]}"
 
 
 def _decode_text(data: bytes) -> str:
@@ -37,57 +38,58 @@ def build_ass_content(track: MkvSubtitleTrack, events: list[SubtitleEvent]) -> b
 
     Args:
         track: Subtitle track with codec_private (ASS header)
-        events: List of subtitle events
+        events: List of subtitle events, sorted by timestamp
 
     Returns:
         Complete ASS file as bytes
     """
-    output = BytesIO()
+    # Header fragments stay bytes (CodecPrivate is raw); dialogue lines are
+    # collected as str and encoded once, then everything is joined in one go
+    header_parts: list[bytes] = []
 
     # Write header from CodecPrivate
     if track.codec_private:
         # Strip null bytes — MKV containers sometimes pad CodecPrivate with trailing \x00
         header = track.codec_private.replace(b"\x00", b"")
-        output.write(header)
+        header_parts.append(header)
 
         if not header.endswith(b"\n"):
-            output.write(b"\n")
+            header_parts.append(b"\n")
 
         # Add Events section if not present
         if b"[Events]" not in header:
-            output.write(b"\n[Events]\n")
-            output.write(
+            header_parts.append(b"\n[Events]\n")
+            header_parts.append(
                 b"Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
             )
     else:
         # Generate minimal ASS header
-        output.write(b"[Script Info]\nScriptType: v4.00+\n\n")
-        output.write(b"[V4+ Styles]\n")
-        output.write(
+        header_parts.append(b"[Script Info]\nScriptType: v4.00+\n\n")
+        header_parts.append(b"[V4+ Styles]\n")
+        header_parts.append(
             b"Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
             b"OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, "
             b"ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
             b"Alignment, MarginL, MarginR, MarginV, Encoding\n"
         )
-        output.write(
+        header_parts.append(
             b"Style: Default,Arial,20,&H00FFFFFF,&H0000FFFF,&H00000000,&H00000000,"
             b"0,0,0,0,100,100,0,0,1,2,0,2,10,10,10,1\n"
         )
-        output.write(b"\n[Events]\n")
-        output.write(
+        header_parts.append(b"\n[Events]\n")
+        header_parts.append(
             b"Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
         )
 
-    events.sort(key=lambda e: e.timestamp_ms)
-
-    for event in events:
-        start_str = _format_ass_time(event.timestamp_ms)
-        end_str = _format_ass_time(event.timestamp_ms + (event.duration_ms or 5000))
-        text = _decode_text(event.data)
+    lines: list[str] = []
+    if track.codec_id == "S_TEXT/ASS":
+        for event in events:
+            start_str = _format_ass_time(event.timestamp_ms)
+            end_str = _format_ass_time(event.timestamp_ms + (event.duration_ms or 5000))
+            text = _decode_text(event.data)
 
-        # For ASS format from MKV, data is:
-        # ReadOrder,Layer,Style,Name,MarginL,MarginR,MarginV,Effect,Text
-        if "," in text and track.codec_id == "S_TEXT/ASS":
+            # For ASS format from MKV, data is:
+            # ReadOrder,Layer,Style,Name,MarginL,MarginR,MarginV,Effect,Text
             parts = text.split(",", 8)
             if len(parts) >= 9:
                 layer = parts[1]
@@ -104,28 +106,26 @@ def build_ass_content(track: MkvSubtitleTrack, events: list[SubtitleEvent]) -> b
                 )
             else:
                 line = f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{text}\n"
-        else:
-            line = f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{text}\n"
-
-        output.write(line.encode("utf-8"))
+            lines.append(line)
+    else:
+        # Plain-text codecs: every event becomes a Default-style dialogue line
+        for event in events:
+            start_str = _format_ass_time(event.timestamp_ms)
+            end_str = _format_ass_time(event.timestamp_ms + (event.duration_ms or 5000))
+            text = _decode_text(event.data)
+            lines.append(f"Dialogue: 0,{start_str},{end_str},Default,,0,0,0,,{text}\n")
 
-    return output.getvalue()
+    header_parts.append("".join(lines).encode("utf-8"))
+    return b"".join(header_parts)
 
 
 def build_srt_content(events: list[SubtitleEvent]) -> bytes:
-    """Build SRT file content from events."""
-    output = BytesIO()
-
-    events.sort(key=lambda e: e.timestamp_ms)
-
+    """Build SRT file content from events (sorted by timestamp)."""
+    lines: list[str] = []
     for i, event in enumerate(events, 1):
-        output.write(f"{i}\n".encode())
-
         start_str = _format_srt_time(event.timestamp_ms)
         end_str = _format_srt_time(event.timestamp_ms + (event.duration_ms or 5000))
-        output.write(f"{start_str} --> {end_str}\n".encode())
-
         text = _decode_text(event.data).strip()
-        output.write(f"{text}\n\n".encode())
+        lines.append(f"{i}\n{start_str} --> {end_str}\n{text}\n\n")
 
-    return output.getvalue()
+    return "".join(lines).encode("utf-8")
@@ -1,6 +1,7 @@
 """Subtitle cache service for background pre-extraction."""
 
 import asyncio
+import os
 from pathlib import Path
 
 from loguru import logger
@@ -8,16 +9,46 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
+from app.core.worker_manager import worker_manager
 from app.models.media import CodecType, MediaItem
-from app.services.streaming import get_virtual_reader
+from app.services.streaming import VirtualStreamReader, build_reader, get_virtual_reader
 from app.services.subtitles import subtitle_extractor
 
-# Cache directories
+# Cache directories (created once here, like the subtitles API does)
 SUBTITLE_CACHE_DIR = Path("cache/subtitles")
+SUBTITLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 FONT_CACHE_DIR = Path("cache/fonts")
+FONT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
-# Max concurrent extractions to avoid overloading Telegram
-MAX_CONCURRENT = 1
+settings = get_settings()
+
+# Media already handled, remembered in-process so repeat checks (startup scan,
+# scanner hooks) skip the filesystem; the on-disk markers stay authoritative
+# across restarts
+_FONT_CHECKED: set[int] = set()
+_SUBTITLE_CACHED: set[int] = set()
+
+# Delay between the first wave of startup extractions, so they don't all
+# refresh file_ids against Telegram at the same instant
+_STAGGER_SECONDS = 0.5
+
+
+def _max_concurrent() -> int:
+    """Concurrent startup extractions: configured, or half the worker pool."""
+    if settings.subtitle_cache_concurrency > 0:
+        return settings.subtitle_cache_concurrency
+    return max(1, worker_manager.pool_status()["total_clients"] // 2)
+
+
+def _fonts_checked(media_id: int) -> bool:
+    """Whether fonts were already checked (dir exists = already processed, even if empty = no fonts)."""
+    if media_id in _FONT_CHECKED:
+        return True
+    if (FONT_CACHE_DIR / str(media_id)).exists():
+        _FONT_CHECKED.add(media_id)
+        return True
+    return False
 
 
 async def pre_extract_fonts(media_id: int, session: AsyncSession) -> bool:
@@ -26,21 +57,29 @@ async def pre_extract_fonts(media_id: int, session: AsyncSession) -> bool:
 
     Returns True if fonts were extracted, False if already cached or no fonts.
     """
-    cache_dir = FONT_CACHE_DIR / str(media_id)
-
-    # Skip if already checked (dir exists = already processed, even if empty = no fonts)
-    if cache_dir.exists():
+    if _fonts_checked(media_id):
         return False
 
     try:
         reader = await get_virtual_reader(session, media_id)
-        if not reader:
-            return False
+    except Exception as e:
+        logger.warning(f"Failed to extract fonts for media {media_id}: {e}")
+        return False
+    if not reader:
+        return False
 
+    return await _extract_fonts(media_id, reader)
+
+
+async def _extract_fonts(media_id: int, reader: VirtualStreamReader) -> bool:
+    """Extract fonts with an already-open reader and write them to the font cache."""
+    cache_dir = FONT_CACHE_DIR / str(media_id)
+    try:
         fonts = await subtitle_extractor.extract_all_fonts_from_reader(reader)
 
         # Always create the directory as a marker that we checked
         cache_dir.mkdir(parents=True, exist_ok=True)
+        _FONT_CHECKED.add(media_id)
 
         if fonts:
             for f in fonts:
@@ -56,25 +95,25 @@ async def pre_extract_fonts(media_id: int, session: AsyncSession) -> bool:
     return False
 
 
-async def pre_extract_subtitles(media_id: int, session: AsyncSession) -> int:
-    """
-    Extract and cache the FIRST subtitle track for a media item.
-
-    Uses direct MKV extraction first (fast), falls back to FFmpeg if needed.
-
-    Returns number of subtitles extracted (0 or 1).
-    """
-    # Get media with streams
+async def _load_media_for_extraction(media_id: int, session: AsyncSession) -> MediaItem | None:
+    """Load a media item with streams (to pick the track) and parts (for the reader) in one go."""
     query = (
         select(MediaItem)
         .where(MediaItem.id == media_id)
-        .options(selectinload(MediaItem.streams))
+        .options(selectinload(MediaItem.streams), selectinload(MediaItem.parts))
     )
     result = await session.execute(query)
-    media = result.scalar_one_or_none()
+    return result.scalar_one_or_none()
 
-    if not media:
-        return 0
+
+def _pending_subtitle_path(media: MediaItem) -> Path | None:
+    """
+    Cache path for the media's FIRST subtitle track, if it still needs extracting.
+
+    Returns None when the media has no subtitle streams or the track is already cached.
+    """
+    if media.id in _SUBTITLE_CACHED:
+        return None
 
     # Find subtitle streams, sorted by index
     subtitle_streams = sorted(
@@ -83,40 +122,69 @@ async def pre_extract_subtitles(media_id: int, session: AsyncSession) -> int:
     )
 
     if not subtitle_streams:
-        return 0
+        return None
 
     # Only extract the first subtitle track
     first_stream = subtitle_streams[0]
 
     # Check if already cached
-    cache_ass = SUBTITLE_CACHE_DIR / f"{media_id}_{first_stream.stream_index}.ass"
-    cache_srt = SUBTITLE_CACHE_DIR / f"{media_id}_{first_stream.stream_index}.srt"
+    cache_ass = SUBTITLE_CACHE_DIR / f"{media.id}_{first_stream.stream_index}.ass"
+    cache_srt = SUBTITLE_CACHE_DIR / f"{media.id}_{first_stream.stream_index}.srt"
 
     if (cache_ass.exists() and cache_ass.stat().st_size > 0) or \
        (cache_srt.exists() and cache_srt.stat().st_size > 0):
+        _SUBTITLE_CACHED.add(media.id)
+        return None
+
+    return cache_ass
+
+
+async def pre_extract_subtitles(media_id: int, session: AsyncSession) -> int:
+    """
+    Extract and cache the FIRST subtitle track for a media item.
+
+    Uses direct MKV extraction first (fast), falls back to FFmpeg if needed.
+
+    Returns number of subtitles extracted (0 or 1).
+    """
+    media = await _load_media_for_extraction(media_id, session)
+    if not media:
+        return 0
+
+    cache_ass = _pending_subtitle_path(media)
+    if cache_ass is None:
         return 0
 
+    reader = build_reader(session, media)
+    if not reader:
+        return 0
+
+    return await _extract_first_subtitle(media_id, reader, cache_ass)
+
+
+async def _extract_first_subtitle(
+    media_id: int, reader: VirtualStreamReader, cache_ass: Path
+) -> int:
+    """Extract the first subtitle track with an already-open reader into cache_ass."""
     content = None
 
     # Direct MKV extraction (fast - reads only needed bytes)
     try:
         from app.services.subtitles.mkv_extractor import extract_subtitle_direct
 
-        reader = await get_virtual_reader(session, media_id)
-        if reader:
-            content = await extract_subtitle_direct(
-                reader,
-                track_index=0,
-                output_format="ass",
-            )
-            if content:
-                logger.info(f"Subtitle extraction succeeded for media {media_id}")
+        content = await extract_subtitle_direct(
+            reader,
+            track_index=0,
+            output_format="ass",
+        )
+        if content:
+            logger.info(f"Subtitle extraction succeeded for media {media_id}")
     except Exception as e:
         logger.warning(f"Subtitle extraction failed for media {media_id}: {e}")
 
     if content:
-        SUBTITLE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
         cache_ass.write_bytes(content)
+        _SUBTITLE_CACHED.add(media_id)
         logger.info(f"Cached first subtitle for media {media_id}")
         return 1
 
@@ -124,9 +192,42 @@ async def pre_extract_subtitles(media_id: int, session: AsyncSession) -> int:
 
 
 async def ensure_cache_populated(media_id: int, session: AsyncSession) -> None:
-    """Check cache and extract missing fonts/subtitles for a media item."""
-    await pre_extract_fonts(media_id, session)
-    await pre_extract_subtitles(media_id, session)
+    """
+    Check cache and extract missing fonts/subtitles for a media item.
+
+    Both extractions share one reader in batch mode and run concurrently,
+    so one's Telegram reads overlap the other's parsing. All DB access
+    happens up front: the session is not used while they run.
+    """
+    media = await _load_media_for_extraction(media_id, session)
+    if not media:
+        return
+
+    fonts_needed = not _fonts_checked(media_id)
+    subtitle_path = _pending_subtitle_path(media)
+    if not fonts_needed and subtitle_path is None:
+        return
+
+    reader = build_reader(session, media)
+    if not reader:
+        return
+
+    async with reader.batch_mode():
+        jobs = []
+        if fonts_needed:
+            jobs.append(_extract_fonts(media_id, reader))
+        if subtitle_path is not None:
+            jobs.append(_extract_first_subtitle(media_id, reader, subtitle_path))
+        await asyncio.gather(*jobs)
+
+
+def _list_cache_dir(directory: Path) -> set[str]:
+    """Entry names in a cache directory, from a single scandir."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
 
 
 async def populate_all_caches(session: AsyncSession) -> None:
@@ -143,6 +244,10 @@ async def populate_all_caches(session: AsyncSession) -> None:
     result = await session.execute(query)
     all_media = result.scalars().all()
 
+    # One listing per cache dir instead of a stat per media / subtitle stream
+    font_dirs = _list_cache_dir(FONT_CACHE_DIR)
+    subtitle_files = _list_cache_dir(SUBTITLE_CACHE_DIR)
+
     # Filter to media with subtitles that need cache population
     media_needing_cache = []
 
@@ -152,12 +257,13 @@ async def populate_all_caches(session: AsyncSession) -> None:
             continue
 
         # Check if fonts were already checked (dir exists = already processed)
-        font_cache = FONT_CACHE_DIR / str(media.id)
-        fonts_cached = font_cache.exists()
+        fonts_cached = media.id in _FONT_CHECKED or str(media.id) in font_dirs
+        if fonts_cached:
+            _FONT_CHECKED.add(media.id)
 
         # Check if any subtitle is cached
-        subtitle_cached = any(
-            (SUBTITLE_CACHE_DIR / f"{media.id}_{s.stream_index}.ass").exists()
+        subtitle_cached = media.id in _SUBTITLE_CACHED or any(
+            f"{media.id}_{s.stream_index}.ass" in subtitle_files
             for s in media.streams if s.codec_type == CodecType.SUBTITLE
         )
 
@@ -170,10 +276,13 @@ async def populate_all_caches(session: AsyncSession) -> None:
 
     logger.info(f"Starting subtitle cache population for {len(media_needing_cache)} media items")
 
-    # Use semaphore to limit concurrency
-    semaphore = asyncio.Semaphore(MAX_CONCURRENT)
+    # Use semaphore to limit concurrency (bounded by the worker pool)
+    max_concurrent = _max_concurrent()
+    semaphore = asyncio.Semaphore(max_concurrent)
 
-    async def extract_with_limit(media_id: int):
+    async def extract_with_limit(i: int, media_id: int):
+        if i < max_concurrent:
+            await asyncio.sleep(i * _STAGGER_SECONDS)
         async with semaphore:
             try:
                 # Create new session for this extraction
@@ -184,7 +293,7 @@ async def populate_all_caches(session: AsyncSession) -> None:
                 logger.warning(f"Cache population failed for media {media_id}: {e}")
 
     # Start all extractions (limited by semaphore)
-    tasks = [extract_with_limit(mid) for mid in media_needing_cache]
+    tasks = [extract_with_limit(i, mid) for i, mid in enumerate(media_needing_cache)]
     await asyncio.gather(*tasks)
 
     logger.info("Background cache population complete")
@@ -6,6 +6,8 @@ Two strategies:
 """
 
 import asyncio
+import time
+from itertools import chain
 
 from loguru import logger
 
@@ -18,6 +20,45 @@ from app.services.mkv_cues import (
 from app.services.subtitles.ebml_parser import SubtitleEvent, parse_cluster_for_subtitles
 
 CLUSTER_SIGNATURE = bytes([0x1F, 0x43, 0xB6, 0x75])
+CUES_TAIL_SIZE = 2 * 1024 * 1024
+
+# Read-range cost model: a new range pays a fixed setup cost (file location,
+# first chunk round trip); bridging a gap costs gap / throughput. Merge while
+# the gap is cheaper than opening another range.
+RANGE_SETUP_SECONDS = 0.2
+DEFAULT_THROUGHPUT = 50 * 1024 * 1024  # bytes/s, used when no usable sample exists
+# Samples smaller or quicker than this (e.g. served from the chunk cache) say
+# nothing about the link
+THROUGHPUT_MIN_SAMPLE_BYTES = 512 * 1024
+THROUGHPUT_MIN_SAMPLE_SECONDS = 0.05
+MAX_GAP_LIMIT = 10 * 1024 * 1024
+
+
+async def read_cues_tail(reader) -> tuple[bytes, float]:
+    """
+    Read the last CUES_TAIL_SIZE bytes, where Cues usually live.
+
+    Returns (tail_data, throughput); the read doubles as a throughput sample
+    (bytes/s) for range merging.
+    """
+    tail_chunks: list[bytes | memoryview] = []
+    start_byte = max(0, reader.total_size - CUES_TAIL_SIZE)
+    # Time from the first chunk on: client acquisition and file_id refreshes
+    # before it are per-read setup, not transfer speed
+    first_chunk_at = 0.0
+    sampled_bytes = 0
+    async for chunk in reader.read_range(start_byte, reader.total_size):
+        if tail_chunks:
+            sampled_bytes += len(chunk)
+        else:
+            first_chunk_at = time.monotonic()
+        tail_chunks.append(chunk)
+    tail_data = b"".join(tail_chunks)
+
+    elapsed = time.monotonic() - first_chunk_at
+    if sampled_bytes < THROUGHPUT_MIN_SAMPLE_BYTES or elapsed < THROUGHPUT_MIN_SAMPLE_SECONDS:
+        return tail_data, DEFAULT_THROUGHPUT
+    return tail_data, sampled_bytes / elapsed
 
 
 async def extract_via_cues(
@@ -25,25 +66,30 @@ async def extract_via_cues(
     header_data: bytes,
     target_track_number: int,
     timecode_scale: int,
+    tail_task: "asyncio.Task[tuple[bytes, float]] | None" = None,
 ) -> tuple[list[SubtitleEvent], bool]:
     """
     Extract subtitle events using MKV Cues index for fast cluster lookup.
 
+    tail_task, if given, is an already running read_cues_tail(reader) so the
+    tail download can overlap the header read.
+
     Returns:
         Tuple of (events, cues_found) — cues_found is False if Cues not available.
     """
     events: list[SubtitleEvent] = []
-    tail_size = 2 * 1024 * 1024
     header_size = len(header_data)
 
-    if reader.total_size <= header_size + tail_size:
+    if reader.total_size <= header_size + CUES_TAIL_SIZE:
+        if tail_task is not None:
+            tail_task.cancel()
         return events, False
 
     try:
-        tail_data = b""
-        start_byte = max(0, reader.total_size - tail_size)
-        async for chunk in reader.read_range(start_byte, reader.total_size):
-            tail_data += chunk
+        if tail_task is None:
+            tail_data, throughput = await read_cues_tail(reader)
+        else:
+            tail_data, throughput = await tail_task
 
         cues_offset_relative = find_cues_offset(tail_data)
         if cues_offset_relative < 0:
@@ -63,7 +109,7 @@ async def extract_via_cues(
             f"Direct MKV extraction: Found {len(cluster_positions)} clusters via Cues"
         )
 
-        read_ranges = _build_read_ranges(cluster_positions)
+        read_ranges = _build_read_ranges(cluster_positions, throughput=throughput)
         logger.info(
             f"Plan: {len(read_ranges)} HTTP requests for "
             f"{len(cluster_positions)} clusters"
@@ -95,34 +141,35 @@ async def extract_via_scan(
 
     while file_offset < reader.total_size:
         read_end = min(file_offset + chunk_size, reader.total_size)
-        chunk_data = b""
+        pieces: list[bytes | memoryview] = []
 
         try:
             async for chunk in reader.read_range(file_offset, read_end):
-                chunk_data += chunk
+                pieces.append(chunk)
         except Exception as e:
             logger.warning(f"Failed to read chunk at {file_offset}: {e}")
             break
+        chunk_data = b"".join(pieces)
 
-        # Find clusters in this chunk
-        offset = 0
-        while offset < len(chunk_data) - 4:
-            if chunk_data[offset:offset + 4] == CLUSTER_SIGNATURE:
-                cluster_events = parse_cluster_for_subtitles(
-                    chunk_data, offset, target_track_number, timecode_scale
-                )
-                events.extend(cluster_events)
+        # Find clusters in this chunk, jumping between signatures with find()
+        scan_end = len(chunk_data) - 4
+        offset = chunk_data.find(CLUSTER_SIGNATURE)
+        while 0 <= offset < scan_end:
+            cluster_events = parse_cluster_for_subtitles(
+                chunk_data, offset, target_track_number, timecode_scale
+            )
+            events.extend(cluster_events)
 
-                try:
-                    elem_id, id_len = read_element_id(chunk_data, offset)
-                    offset += id_len
-                    cluster_size, size_len = read_vint(chunk_data, offset)
-                    offset += size_len + cluster_size
-                except Exception:
-                    offset += 1
-            else:
+            try:
+                elem_id, id_len = read_element_id(chunk_data, offset)
+                offset += id_len
+                cluster_size, size_len = read_vint(chunk_data, offset)
+                offset += size_len + cluster_size
+            except Exception:
                 offset += 1
 
+            offset = chunk_data.find(CLUSTER_SIGNATURE, offset)
+
         file_offset = read_end
 
     return events
@@ -142,14 +189,20 @@ def _find_segment_data_start(header_data: bytes) -> int:
     return 0
 
 
-def _build_read_ranges(cluster_positions: list[int]) -> list[tuple[int, int]]:
+def _build_read_ranges(
+    cluster_positions: list[int],
+    *,
+    throughput: float = DEFAULT_THROUGHPUT,
+    setup_seconds: float = RANGE_SETUP_SECONDS,
+    cluster_read_size: int = 128 * 1024,
+) -> list[tuple[int, int]]:
     """Merge close cluster positions into read ranges to minimize HTTP requests."""
     if not cluster_positions:
         return []
 
-    gap_limit = 10 * 1024 * 1024
+    # Bytes we can read in the time a new range costs to open
+    gap_limit = max(cluster_read_size, min(int(setup_seconds * throughput), MAX_GAP_LIMIT))
     max_merged_size = 30 * 1024 * 1024
-    cluster_read_size = 128 * 1024
 
     read_ranges: list[tuple[int, int]] = []
     current_start = cluster_positions[0]
@@ -178,49 +231,48 @@ async def _parallel_fetch_and_parse(
     timecode_scale: int,
 ) -> list[SubtitleEvent]:
     """Fetch cluster data in parallel and parse for subtitle events."""
-    events: list[SubtitleEvent] = []
+    # Filled by range index, so the merge below needs no sort
+    chunk_events: list[list[SubtitleEvent] | None] = [None] * len(read_ranges)
 
     async with reader.batch_mode():
 
-        async def fetch_range(start: int, end: int, index: int):
-            data = bytearray()
+        async def fetch_range(start: int, end: int) -> bytearray | None:
             try:
                 read_end = min(end, reader.total_size)
-                async for chunk in reader.read_range(start, read_end):
-                    data.extend(chunk)
-                return index, data
+                # One allocation at the final size instead of growing via extend()
+                data = bytearray(read_end - start)
+                with memoryview(data) as view:
+                    written = await reader.read_range_into(view, start, read_end)
+                if written < len(data):
+                    del data[written:]
+                return data
             except Exception as e:
                 logger.warning(f"Failed to read range {start}-{end}: {e}")
-                return index, None
+                return None
 
         semaphore = asyncio.Semaphore(20)
 
-        async def fetch_with_sem(start: int, end: int, index: int):
+        # Each task parses its own range once fetched, so parsing overlaps the
+        # downloads still in flight; the permit is released before parsing
+        async def fetch_and_parse(start: int, end: int, index: int):
             async with semaphore:
-                return await fetch_range(start, end, index)
+                chunk_data = await fetch_range(start, end)
+            if chunk_data is not None:
+                chunk_events[index] = await _parse_clusters_in_chunk(
+                    chunk_data, start, reader, target_track_number, timecode_scale
+                )
 
         tasks = [
-            fetch_with_sem(start, end, i)
+            fetch_and_parse(start, end, i)
             for i, (start, end) in enumerate(read_ranges)
             if start < reader.total_size
         ]
 
-        results = await asyncio.gather(*tasks) if tasks else []
+        if tasks:
+            await asyncio.gather(*tasks)
 
-    # Process results in order
-    valid_results = sorted(
-        [(idx, data) for idx, data in results if data is not None],
-        key=lambda x: x[0],
-    )
-
-    for idx, chunk_data in valid_results:
-        start, _end = read_ranges[idx]
-        chunk_events = _parse_clusters_in_chunk(
-            chunk_data, start, reader, target_track_number, timecode_scale
-        )
-        events.extend(chunk_events)
-
-    return events
+    # Merge in range order
+    return list(chain.from_iterable(filter(None, chunk_events)))
 
 
 async def _parse_clusters_in_chunk(
@@ -236,13 +288,10 @@ async def _parse_clusters_in_chunk(
 
     while curr_offset < len(chunk_data) - 4:
         try:
-            if chunk_data[curr_offset:curr_offset + 4] != CLUSTER_SIGNATURE:
-                next_pos = chunk_data.find(CLUSTER_SIGNATURE, curr_offset + 1)
-                if next_pos != -1:
-                    curr_offset = next_pos
-                else:
-                    break
-                continue
+            # Jump straight to the next Cluster signature (no-op when already on one)
+            curr_offset = chunk_data.find(CLUSTER_SIGNATURE, curr_offset)
+            if curr_offset < 0:
+                break
 
             id_len = 4
             size_pos = curr_offset + id_len
@@ -267,10 +316,11 @@ async def _parse_clusters_in_chunk(
                     break
 
             if full_cluster_end <= len(chunk_data):
-                c_data = chunk_data[curr_offset:full_cluster_end]
                 try:
+                    # Parse in place: the cluster's own size bounds the walk,
+                    # so there is no need to copy it out of chunk_data first
                     cluster_events = parse_cluster_for_subtitles(
-                        c_data, 0, target_track_number, timecode_scale
+                        chunk_data, curr_offset, target_track_number, timecode_scale
                     )
                     if cluster_events:
                         events.extend(cluster_events)
@@ -24,9 +24,10 @@ BLOCK_GROUP_ID = 0xA0
 BLOCK_ID = 0xA1
 
 TRACK_TYPE_SUBTITLE = 17
+TRACKS_SIGNATURE = TRACKS_ID.to_bytes(4)
 
 
-@dataclass
+@dataclass(slots=True)
 class MkvSubtitleTrack:
     """Subtitle track information from MKV header."""
 
@@ -35,7 +36,7 @@ class MkvSubtitleTrack:
     codec_private: bytes | None  # ASS header styles
 
 
-@dataclass
+@dataclass(slots=True)
 class SubtitleEvent:
     """A single subtitle event/dialog line."""
 
@@ -46,32 +47,36 @@ class SubtitleEvent:
 
 def parse_tracks(data: bytes) -> list[MkvSubtitleTrack]:
     """Parse Tracks element to find subtitle tracks."""
-    tracks_signature = bytes([0x16, 0x54, 0xAE, 0x6B])
+    tracks, _tracks_end = parse_tracks_with_end(data)
+    if not tracks:
+        logger.warning(f"No valid Tracks element found in {len(data)} bytes")
+    return tracks
 
+
+def parse_tracks_with_end(data: bytes) -> tuple[list[MkvSubtitleTrack], int]:
+    """
+    Parse Tracks element and report where it ends.
+
+    Returns (subtitle_tracks, tracks_end). tracks_end may lie past len(data)
+    when the element is truncated, letting callers fetch more and retry.
+    """
+    # Every signature match is validated in turn; find() ends the search
     search_start = 0
-    tracks_offset = -1
-    attempt = 0
 
     while True:
-        attempt += 1
-        if attempt > 10:
-            break
-
-        tracks_offset = data.find(tracks_signature, search_start)
+        tracks_offset = data.find(TRACKS_SIGNATURE, search_start)
 
         if tracks_offset < 0:
-            if attempt == 1:
-                logger.warning(f"Tracks element not found in {len(data)} bytes")
             break
 
-        logger.debug(f"Found Tracks signature at offset {tracks_offset} (attempt {attempt})")
+        logger.debug(f"Found Tracks signature at offset {tracks_offset}")
+        search_start = tracks_offset + 4
 
         offset = tracks_offset
         elem_id, id_len = read_element_id(data, offset)
 
         if elem_id != TRACKS_ID:
             logger.debug(f"  Not a valid Tracks element (ID=0x{elem_id:X})")
-            search_start = tracks_offset + 4
             continue
 
         offset += id_len
@@ -79,7 +84,6 @@ def parse_tracks(data: bytes) -> list[MkvSubtitleTrack]:
 
         # Sanity check the size
         if tracks_size <= 0 or tracks_size > 1_000_000:
-            search_start = tracks_offset + 4
             continue
 
         offset += size_len
@@ -90,12 +94,9 @@ def parse_tracks(data: bytes) -> list[MkvSubtitleTrack]:
                 f"Direct MKV extraction: Found {len(tracks)} subtitle tracks "
                 f"at offset {tracks_offset}"
             )
-            return tracks
+            return tracks, offset + tracks_size
 
-        search_start = tracks_offset + 4
-
-    logger.warning("No valid Tracks element found")
-    return []
+    return [], 0
 
 
 def _parse_tracks_content(
@@ -134,8 +135,9 @@ def _parse_track_entry(
 
     track_number = None
     track_type = None
-    codec_id = None
-    codec_private = None
+    # (offset, size) spans; only sliced once the entry is known to be a subtitle
+    codec_id_span = None
+    codec_private_span = None
 
     while offset < end and offset < len(data):
         elem_id, id_len = read_element_id(data, offset)
@@ -152,22 +154,32 @@ def _parse_track_entry(
             track_number = read_uint(data, offset, elem_size)
         elif elem_id == TRACK_TYPE_ID:
             track_type = read_uint(data, offset, elem_size)
+            if track_type != TRACK_TYPE_SUBTITLE:
+                # Video/audio entry: skip the rest, including large CodecPrivate
+                return None
         elif elem_id == CODEC_ID_ID:
-            codec_id = data[offset:offset + elem_size].decode("utf-8", errors="ignore")
+            codec_id_span = (offset, elem_size)
         elif elem_id == CODEC_PRIVATE_ID:
-            codec_private = data[offset:offset + elem_size]
+            codec_private_span = (offset, elem_size)
 
         offset += elem_size
 
-    if track_type == TRACK_TYPE_SUBTITLE and track_number is not None and codec_id:
-        logger.debug(f"Found subtitle track {track_number}: {codec_id}")
-        return MkvSubtitleTrack(
-            track_number=track_number,
-            codec_id=codec_id,
-            codec_private=codec_private,
-        )
+    if track_type != TRACK_TYPE_SUBTITLE or track_number is None or codec_id_span is None:
+        return None
 
-    return None
+    codec_id = data[codec_id_span[0] : sum(codec_id_span)].decode("utf-8", errors="ignore")
+    if not codec_id:
+        return None
+    codec_private = None
+    if codec_private_span is not None:
+        codec_private = data[codec_private_span[0] : sum(codec_private_span)]
+
+    logger.debug(f"Found subtitle track {track_number}: {codec_id}")
+    return MkvSubtitleTrack(
+        track_number=track_number,
+        codec_id=codec_id,
+        codec_private=codec_private,
+    )
 
 
 def parse_cluster_for_subtitles(
@@ -240,12 +252,20 @@ def _parse_block(
     target_track: int,
 ) -> SubtitleEvent | None:
     """Parse a SimpleBlock/Block element."""
-    if size < 4:
+    if size < 4 or offset >= len(data):
         return None
 
-    track_num, track_len = read_vint(data, offset)
-    if track_num != target_track:
-        return None
+    first_byte = data[offset]
+    if first_byte & 0x80:
+        # 1-byte track number (what muxers write): compare without a vint decode,
+        # which rejects other tracks' blocks cheaply
+        if first_byte & 0x7F != target_track:
+            return None
+        track_len = 1
+    else:
+        track_num, track_len = read_vint(data, offset)
+        if track_num != target_track:
+            return None
 
     rel_offset = offset + track_len
     if rel_offset + 2 > offset + size:
@@ -289,12 +309,20 @@ def _parse_block_group(
             break
         offset += size_len
 
+        # Stop as soon as the group is settled: trailing ReferenceBlock etc. are unused
         if elem_id == BLOCK_ID:
             block_event = _parse_block(
                 data, offset, elem_size, cluster_timecode, target_track
             )
+            if block_event is None:
+                # Another track's block (or unparsable): nothing to extract
+                return events
+            if duration is not None:
+                break
         elif elem_id == 0x9B:  # BlockDuration
             duration = read_uint(data, offset, elem_size)
+            if block_event is not None:
+                break
 
         offset += elem_size
 
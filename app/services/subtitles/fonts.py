@@ -1,31 +1,108 @@
 """Font extraction logic."""
 
+import struct
+from collections import OrderedDict
 from io import BytesIO
+from pathlib import Path
 
+from fontTools.misc.encodingTools import getEncoding
 from fontTools.ttLib import TTFont
 from loguru import logger
 
+# TrueType, CFF and Apple TrueType sfnt versions; only 'name' is read from these
+_SFNT_VERSIONS = (b"\x00\x01\x00\x00", b"OTTO", b"true")
+_WANTED_NAME_IDS = (1, 4, 6)
+
+# (nameID, platformID, platEncID, langID, raw string); platEncID picks the codec
+_NameRecord = tuple[int, int, int, int, bytes]
+
+# Names per cached font file, keyed by (path, mtime_ns, size); LRU-bounded
+_FONT_NAME_CACHE: OrderedDict[tuple[str, int, int], list[str]] = OrderedDict()
+_FONT_NAME_CACHE_SIZE = 256
+
 
 def extract_font_names(font_data: bytes) -> list[str]:
     """Extract internal font names from TTF/OTF font data."""
     names: list[str] = []
     try:
-        font = TTFont(BytesIO(font_data))
-        name_table = font.get("name")
-
-        if name_table:
-            # Name IDs: 1=Family, 4=Full Name, 6=PostScript Name
-            for name_id in [4, 1, 6]:
-                for record in name_table.names:
-                    if record.nameID == name_id:
-                        try:
-                            decoded = record.toUnicode()
-                            if decoded and decoded not in names:
-                                names.append(decoded)
-                        except Exception:
-                            pass
-        font.close()
+        records = _name_records(font_data)
+
+        # Name IDs: 1=Family, 4=Full Name, 6=PostScript Name
+        for name_id in [4, 1, 6]:
+            for record_id, platform_id, enc_id, lang_id, raw in records:
+                if record_id == name_id:
+                    try:
+                        decoded = raw.decode(getEncoding(platform_id, enc_id, lang_id, "ascii"))
+                        if decoded and decoded not in names:
+                            names.append(decoded)
+                    except Exception:
+                        pass
     except Exception as e:
         logger.debug(f"Could not extract font names: {e}")
 
     return names
+
+
+def _name_records(font_data: bytes) -> list[_NameRecord]:
+    """Return the font's name records, reading plain sfnt 'name' tables directly."""
+    if font_data[:4] not in _SFNT_VERSIONS:
+        # WOFF/WOFF2 and anything unusual go through the full fontTools reader
+        font = TTFont(BytesIO(font_data))
+        try:
+            name_table = font.get("name")
+            if not name_table:
+                return []
+            return [
+                (r.nameID, r.platformID, r.platEncID, r.langID, r.string)
+                for r in name_table.names
+                if r.nameID in _WANTED_NAME_IDS
+            ]
+        finally:
+            font.close()
+
+    # sfnt offset table: version, numTables, then 16-byte table records.
+    # Truncated data (directory or name table cut short) has no usable names.
+    if len(font_data) < 12:
+        return []
+    (num_tables,) = struct.unpack_from(">H", font_data, 4)
+    if len(font_data) < 12 + 16 * num_tables:
+        return []
+    for i in range(num_tables):
+        tag, _checksum, offset, length = struct.unpack_from(">4sLLL", font_data, 12 + 16 * i)
+        if tag == b"name":
+            break
+    else:
+        return []
+    if length < 6 or offset + length > len(font_data):
+        return []
+
+    table = font_data[offset : offset + length]
+    _format, count, string_offset = struct.unpack_from(">HHH", table)
+    strings = table[string_offset:]
+    count = min(count, (len(table) - 6) // 12)
+
+    records: list[_NameRecord] = []
+    for platform_id, enc_id, lang_id, name_id, str_length, str_offset in struct.iter_unpack(
+        ">6H", table[6 : 6 + 12 * count]
+    ):
+        if name_id not in _WANTED_NAME_IDS or str_offset + str_length > len(strings):
+            continue
+        raw = strings[str_offset : str_offset + str_length]
+        records.append((name_id, platform_id, enc_id, lang_id, raw))
+    return records
+
+
+def extract_font_names_from_file(path: Path) -> list[str]:
+    """Extract font names from a font file, memoized until the file changes."""
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    cached = _FONT_NAME_CACHE.get(key)
+    if cached is not None:
+        _FONT_NAME_CACHE.move_to_end(key)
+        return list(cached)
+
+    names = extract_font_names(path.read_bytes())
+    _FONT_NAME_CACHE[key] = names
+    if len(_FONT_NAME_CACHE) > _FONT_NAME_CACHE_SIZE:
+        _FONT_NAME_CACHE.popitem(last=False)
+    return list(names)
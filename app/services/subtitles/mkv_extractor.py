@@ -5,19 +5,31 @@ Reads only the necessary bytes (header + subtitle clusters) instead of
 downloading the entire file.
 
 Workflow:
-1. Read header (~30MB) for track info
+1. Read header progressively (1MB up to 30MB) until Tracks is complete
 2. Read Cues (from tail) to find subtitle cluster positions
 3. Read only those clusters and extract subtitle blocks
 4. Reconstruct ASS/SRT file from the data
 """
 
+import asyncio
+from operator import attrgetter
+
 from loguru import logger
 
+from app.services.mkv_cues import SEGMENT_INFO_ID
 from app.services.subtitles.builders import build_ass_content, build_srt_content
-from app.services.subtitles.cluster_reader import extract_via_cues, extract_via_scan
-from app.services.subtitles.ebml_parser import parse_tracks
+from app.services.subtitles.cluster_reader import (
+    CUES_TAIL_SIZE,
+    extract_via_cues,
+    extract_via_scan,
+    read_cues_tail,
+)
+from app.services.subtitles.ebml_parser import parse_tracks_with_end
 
 HEADER_SIZE = 31_457_280  # 30MB — enough to reliably get Tracks element
+# Progressive header reads: most files finish Tracks within the first MB
+HEADER_STEPS = (1 << 20, 4 << 20, 16 << 20, HEADER_SIZE)
+SEGMENT_INFO_SIGNATURE = SEGMENT_INFO_ID.to_bytes(4)
 
 
 async def extract_subtitle_direct(
@@ -42,43 +54,77 @@ async def extract_subtitle_direct(
 
     logger.info(f"Starting direct subtitle extraction: track={track_index}, format={output_format}")
 
-    # 1. Read header for track info
-    header_data = b""
-    try:
-        async for chunk in reader.read_range(0, HEADER_SIZE):
-            header_data += chunk
-    except Exception as e:
-        logger.error(f"Failed to read MKV header: {e}")
-        return None
-
-    logger.debug(f"Read {len(header_data)} bytes from MKV header")
-
-    # 2. Parse tracks
-    subtitle_tracks = parse_tracks(header_data)
-    if not subtitle_tracks:
-        logger.warning("No subtitle tracks found in MKV")
-        return None
+    # Cues live in the tail: fetch it alongside the header read. With a single
+    # client both reads share one download slot, so the tail waits for the
+    # first header step instead of delaying it.
+    tail_task = None
+    fetch_tail = reader.total_size > HEADER_STEPS[0] + CUES_TAIL_SIZE
+    if fetch_tail and reader.client_count > 1:
+        tail_task = asyncio.create_task(read_cues_tail(reader))
 
-    if track_index >= len(subtitle_tracks):
-        logger.warning(
-            f"Track index {track_index} out of range (have {len(subtitle_tracks)} tracks)"
+    try:
+        # 1. Read header in growing steps, stopping once Tracks (and Info) are in hand
+        # One growing bytearray: each step appends without re-joining earlier steps
+        header_data = bytearray()
+        subtitle_tracks = []
+        read_end = 0
+        for step in HEADER_STEPS:
+            step_end = min(step, reader.total_size)
+            if step_end <= read_end:
+                break
+            try:
+                async for chunk in reader.read_range(read_end, step_end):
+                    header_data.extend(chunk)
+            except Exception as e:
+                logger.error(f"Failed to read MKV header: {e}")
+                return None
+            read_end = step_end
+            if fetch_tail and tail_task is None:
+                tail_task = asyncio.create_task(read_cues_tail(reader))
+
+            # 2. Parse tracks
+            subtitle_tracks, tracks_end = parse_tracks_with_end(header_data)
+            if (
+                subtitle_tracks
+                and tracks_end <= len(header_data)
+                and SEGMENT_INFO_SIGNATURE in header_data
+            ):
+                break
+
+        logger.debug(f"Read {len(header_data)} bytes from MKV header")
+
+        if not subtitle_tracks:
+            logger.warning("No subtitle tracks found in MKV")
+            return None
+
+        if track_index >= len(subtitle_tracks):
+            logger.warning(
+                f"Track index {track_index} out of range (have {len(subtitle_tracks)} tracks)"
+            )
+            return None
+
+        target_track = subtitle_tracks[track_index]
+        logger.info(f"Extracting track {target_track.track_number}: {target_track.codec_id}")
+
+        # 3. Get timecode scale
+        timecode_scale = extract_timecode_scale(header_data)
+
+        # 4. Extract events — try Cues first, fallback to sequential scan
+        events, cues_found = await extract_via_cues(
+            reader, header_data, target_track.track_number, timecode_scale, tail_task
         )
-        return None
-
-    target_track = subtitle_tracks[track_index]
-    logger.info(f"Extracting track {target_track.track_number}: {target_track.codec_id}")
-
-    # 3. Get timecode scale
-    timecode_scale = extract_timecode_scale(header_data)
-
-    # 4. Extract events — try Cues first, fallback to sequential scan
-    events, cues_found = await extract_via_cues(
-        reader, header_data, target_track.track_number, timecode_scale
-    )
+    finally:
+        # Drop an unused tail read; a finished one gets its error retrieved so an
+        # early return does not leave "exception was never retrieved" behind
+        if tail_task is not None:
+            if not tail_task.done():
+                tail_task.cancel()
+            elif not tail_task.cancelled():
+                tail_task.exception()
 
     if not cues_found and (not events or len(events) < 1000):
         events = await extract_via_scan(
-            reader, HEADER_SIZE, target_track.track_number, timecode_scale
+            reader, len(header_data), target_track.track_number, timecode_scale
         )
 
     if not events:
@@ -87,7 +133,8 @@ async def extract_subtitle_direct(
 
     logger.info(f"Total {len(events)} subtitle events extracted")
 
-    # 5. Build output file
+    # 5. Build output file (builders expect events in timestamp order)
+    events.sort(key=attrgetter("timestamp_ms"))
     if output_format == "ass":
         return build_ass_content(target_track, events)
     else:
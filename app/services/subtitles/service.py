@@ -151,12 +151,10 @@ class SubtitleExtractor:
 
             # Read header directly from VirtualStreamReader
             try:
-                chunks = []
-                async for chunk in reader.read_range(0, HEADER_SIZE):
-                    chunks.append(chunk)
-                header_data = b"".join(chunks)
-                header_file.write_bytes(header_data)
-                logger.debug(f"Read {len(header_data)} bytes directly for header snipe")
+                header_buf = bytearray(min(HEADER_SIZE, reader.total_size))
+                header_len = await reader.read_range_into(memoryview(header_buf), 0, HEADER_SIZE)
+                header_file.write_bytes(memoryview(header_buf)[:header_len])
+                logger.debug(f"Read {header_len} bytes directly for header snipe")
             except Exception as e:
                 logger.warning(f"Header read failed: {type(e).__name__}: {e}")
                 return []
@@ -0,0 +1,76 @@
+"""Tests for font name extraction."""
+
+from io import BytesIO
+
+from fontTools.fontBuilder import FontBuilder
+from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+from app.services.subtitles import fonts
+
+
+def _build_font(flavor: str | None = None) -> bytes:
+    """Build a minimal TrueType font with Mac and Windows name records."""
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder([".notdef"])
+    fb.setupCharacterMap({})
+    fb.setupGlyf({".notdef": TTGlyphPen(None).glyph()})
+    fb.setupHorizontalMetrics({".notdef": (500, 0)})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable(
+        {
+            "familyName": "Café Sans",
+            "styleName": "Regular",
+            "fullName": "Café Sans Regular",
+            "psName": "CafeSans-Regular",
+        },
+        mac=True,
+    )
+    fb.setupOS2()
+    fb.setupPost()
+    fb.font.flavor = flavor
+    buf = BytesIO()
+    fb.save(buf)
+    return buf.getvalue()
+
+
+def test_name_records_reads_sfnt_name_table():
+    """A plain TTF is parsed directly, keeping only the wanted name IDs."""
+    font_data = _build_font()
+
+    records = fonts._name_records(font_data)
+
+    assert {name_id for name_id, *_ in records} == {1, 4, 6}
+    assert (4, 3, 1, 0x409, "Café Sans Regular".encode("utf-16-be")) in records
+    assert (1, 1, 0, 0, "Café Sans".encode("mac_roman")) in records
+    assert fonts.extract_font_names(font_data) == [
+        "Café Sans Regular",
+        "Café Sans",
+        "CafeSans-Regular",
+    ]
+
+
+def test_name_records_truncated_font_returns_nothing():
+    """A name table past the end of the data or a cut directory yields no records."""
+    font_data = _build_font()
+
+    assert fonts._name_records(font_data[:200]) == []
+    assert fonts._name_records(font_data[:14]) == []
+    assert fonts.extract_font_names(font_data[:200]) == []
+
+
+def test_name_records_non_sfnt_goes_through_fonttools(monkeypatch):
+    """WOFF data takes the TTFont branch and gives the same records."""
+    opened: list[bytes] = []
+    real_ttfont = fonts.TTFont
+
+    def spy_ttfont(file):
+        opened.append(file.getvalue())
+        return real_ttfont(file)
+
+    monkeypatch.setattr(fonts, "TTFont", spy_ttfont)
+    woff_data = _build_font("woff")
+
+    records = fonts._name_records(woff_data)
+
+    assert opened == [woff_data]
+    assert sorted(records) == sorted(fonts._name_records(_build_font()))
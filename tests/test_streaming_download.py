@@ -0,0 +1,67 @@
+"""Tests for stream_part range and chunk cache handling."""
+
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.streaming import cache, download
+from app.services.streaming.download import stream_part
+
+CHUNK = 16
+DATA = bytes(range(256))[: 5 * CHUNK + 7]
+
+
+class FakeClient:
+    """Serves DATA in CHUNK-sized pieces and records each stream_media call."""
+
+    def __init__(self):
+        self.calls: list[tuple[int, int]] = []
+
+    async def stream_media(self, file_id, offset=0, limit=0):
+        self.calls.append((offset, limit))
+        for idx in range(offset, offset + limit):
+            chunk = DATA[idx * CHUNK : (idx + 1) * CHUNK]
+            if not chunk:
+                return
+            yield chunk
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(download, "PYROGRAM_CHUNK_SIZE", CHUNK)
+    monkeypatch.setattr(cache, "_CHUNK_CACHE", OrderedDict())
+
+
+@pytest.mark.parametrize(
+    ("offset", "length", "cached", "expected_calls"),
+    [
+        pytest.param(18, 10, (), [(1, 1)], id="inside-one-chunk"),
+        pytest.param(5, 50, (), [(0, 4)], id="spanning-chunks-cold"),
+        pytest.param(80, 7, (), [(5, 1)], id="short-last-chunk"),
+        pytest.param(5, 50, (0, 1, 2, 3), [], id="fully-cached"),
+        pytest.param(5, 70, (0, 1, 4), [(2, 2)], id="cached-ends-middle-miss"),
+        pytest.param(5, 70, (1, 2), [(0, 5)], id="cached-middle-only"),
+    ],
+)
+async def test_stream_part_serves_exact_range(offset, length, cached, expected_calls):
+    """The requested bytes come back exactly, fetching only the uncached run."""
+    for idx in cached:
+        cache._cache_chunk(1, idx, DATA[idx * CHUNK : (idx + 1) * CHUNK])
+    client = FakeClient()
+    part = SimpleNamespace(id=1, part_index=0, telegram_file_id="file")
+
+    chunks = [
+        bytes(chunk)
+        async for chunk in stream_part(
+            client, part, offset, length, is_force_released=lambda: False
+        )
+    ]
+
+    assert b"".join(chunks) == DATA[offset : offset + length]
+    assert all(chunks)
+    assert client.calls == expected_calls
+    # Every chunk the range touched is now cached in full
+    first, last = offset // CHUNK, (offset + length - 1) // CHUNK
+    for idx in range(first, last + 1):
+        assert cache._get_cached_chunk(1, idx) == DATA[idx * CHUNK : (idx + 1) * CHUNK]
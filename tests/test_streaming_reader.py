@@ -0,0 +1,106 @@
+"""Tests for VirtualStreamReader client lifecycle."""
+
+import asyncio
+from collections import OrderedDict
+from types import SimpleNamespace
+
+from app.services.streaming import cache
+from app.services.streaming import reader as reader_module
+from app.services.streaming.reader import VirtualStreamReader
+
+
+class FakePool:
+    """Stand-in for worker_manager that records which clients are checked out."""
+
+    def __init__(self, size: int):
+        self.idle = [object() for _ in range(size)]
+        self.released: set[int] = set()
+
+    async def get_available_clients(self, limit: int = 1):
+        clients, self.idle = self.idle[:limit], self.idle[limit:]
+        self.released.difference_update(id(c) for c in clients)
+        return clients
+
+    async def try_acquire_one(self):
+        return None
+
+    def pool_pressure(self) -> float:
+        return 0.0
+
+    def release_clients(self, clients):
+        self.idle.extend(clients)
+        self.released.update(id(c) for c in clients)
+
+
+async def test_concurrent_reads_keep_clients_until_last_finishes(monkeypatch):
+    """A non-batch reader must not release clients another read_range still uses."""
+    pool = FakePool(3)
+    used_after_release: list[object] = []
+
+    async def fake_stream_part(client, part, offset, length, is_force_released):
+        for _ in range(3):
+            await asyncio.sleep(0.01 if length > 10 else 0)
+            if id(client) in pool.released:
+                used_after_release.append(client)
+            yield b"x" * (length // 3)
+
+    async def fake_ensure_file_ids(parts, client):
+        return None
+
+    monkeypatch.setattr(reader_module, "worker_manager", pool)
+    monkeypatch.setattr(reader_module, "stream_part", fake_stream_part)
+    monkeypatch.setattr(reader_module, "ensure_file_ids_for_client", fake_ensure_file_ids)
+
+    part = SimpleNamespace(id=1, part_index=0, file_size=300)
+    reader = VirtualStreamReader(SimpleNamespace(id=1, parts=[part]), session=None)
+
+    async def read(start: int, end: int) -> int:
+        return sum([len(chunk) async for chunk in reader.read_range(start, end)])
+
+    # The short read finishes first, while the long one is still streaming
+    long_read, short_read = await asyncio.gather(read(0, 300), read(0, 9))
+
+    assert (long_read, short_read) == (300, 9)
+    assert used_after_release == []
+    assert reader._clients == []
+    assert len(pool.idle) == 3
+
+
+async def test_next_part_prefetch_prefers_another_client(monkeypatch):
+    """The boundary prefetch runs on a second client once it has a file_id for the part."""
+    pool = FakePool(2)
+    prefetches: list[tuple[object, str | None]] = []
+
+    async def fake_stream_part(client, part, offset, length, is_force_released):
+        yield b"x" * length
+
+    async def fake_prefetch(client, part, file_id=None):
+        prefetches.append((client, file_id))
+
+    async def fake_ensure_file_ids(parts, client):
+        return None
+
+    monkeypatch.setattr(reader_module, "worker_manager", pool)
+    monkeypatch.setattr(reader_module, "stream_part", fake_stream_part)
+    monkeypatch.setattr(reader_module, "prefetch_first_chunk", fake_prefetch)
+    monkeypatch.setattr(reader_module, "ensure_file_ids_for_client", fake_ensure_file_ids)
+    monkeypatch.setattr(cache, "_FILE_ID_CACHE", OrderedDict())
+
+    parts = [
+        SimpleNamespace(id=1, part_index=0, file_size=100),
+        SimpleNamespace(id=2, part_index=1, file_size=100),
+    ]
+    reader = VirtualStreamReader(SimpleNamespace(id=1, parts=parts), session=None)
+    reading, other = pool.idle
+    reader._clients = [reading, other]
+    reader._persistent = True
+
+    async def read() -> int:
+        return sum([len(chunk) async for chunk in reader.read_range(0, 200)])
+
+    # No file_id for the other client yet: fall back to the reading client
+    assert await read() == 200
+    cache._put_file_id((2, id(other)), "other-file-id", cache._now())
+    assert await read() == 200
+
+    assert prefetches == [(reading, None), (other, "other-file-id")]